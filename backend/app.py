@@ -3,269 +3,855 @@ Simple Flask backend for restaurant menu creator
 Uses fal.ai beta-image-232 for generation and editing
 """
 
-from flask import Flask, request, jsonify
+from collections import defaultdict
+from typing import List, Optional, Union
+import asyncio
+import hashlib
+import logging
+import os
+import queue
+from flask import Flask, Response, abort, request, jsonify, make_response, stream_with_context
 from flask_cors import CORS
-import fal_client
+import httpx
+import msgspec
 from dotenv import load_dotenv
-from nvidia_client import NvidiaClient
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
+from nvidia_client import get_nvidia_client
+from cache import ResponseCache
+from semantic_cache import SemanticCache, normalize_prompt
+from menu_stream import MenuStreamParser
+from menu_presets import find_preset
+from singleflight import SingleFlight
+from fal_webhooks import FalWebhooks, SIGNATURES_AVAILABLE
+from async_runtime import run_async, spawn
+from json_provider import ORJSONProvider
+from logging_config import configure_logging
+from timing import timed, record, elapsed_ms, log_request_timing
+import timing
 
 load_dotenv()
+configure_logging()
+logger = logging.getLogger(__name__)
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CORS(app)
+timing.init_app(app)
+
+# Initialize NVIDIA client wrapper (one per worker, shared by all requests)
+nvidia_client = get_nvidia_client()
+
+# Shared async fal.ai client: it lives on the background event loop, so one
+# pooled keep-alive HTTPS connection set serves every submit/subscribe/poll
+# and waiting on fal never ties up more than a coroutine. Created on first
+# use (see get_fal) so fal_client's import stays off the cold start path
+fal = None
+
+# With a public URL, fal POSTs finished jobs to /api/fal-webhook instead of
+# every job holding a status poll open; without one, jobs are polled
+PUBLIC_URL = os.getenv('PUBLIC_URL', '')
+fal_webhooks = None
+if PUBLIC_URL:
+    webhook_secret = os.getenv('FAL_WEBHOOK_SECRET') or (
+        FalWebhooks.derive_secret(os.getenv('FAL_KEY')) if os.getenv('FAL_KEY') else ''
+    )
+    if not webhook_secret:
+        logger.warning("⚠ PUBLIC_URL is set but there is no FAL_KEY or FAL_WEBHOOK_SECRET; polling fal instead")
+    elif not SIGNATURES_AVAILABLE:
+        logger.warning("⚠ PUBLIC_URL is set but PyNaCl is not installed to verify fal webhooks; polling fal instead")
+    else:
+        fal_webhooks = FalWebhooks(
+            PUBLIC_URL,
+            webhook_secret,
+            ResponseCache('fal_webhooks', memory_size=256, expire=3600),
+        )
+
+# Generated food images keyed by (prompt, seed)
+food_image_cache = ResponseCache('food_images')
+
+# Food image jobs in flight at once per /api/generate request, to stay
+# within fal's rate limits
+FOOD_IMAGE_CONCURRENCY = int(os.getenv('FOOD_IMAGE_CONCURRENCY', '6'))
+
+# fal jobs in flight at once across every request in this worker, so
+# concurrent menus share one rate-limit budget instead of each taking its own
+FAL_CONCURRENCY = int(os.getenv('FAL_CONCURRENCY', '16'))
+fal_slots = None
+
+# In-flight food image jobs by cache key (only touched on the shared loop)
+food_image_jobs = {}
+
+# Encoded /api/generate response bodies keyed by ETag of the request payload
+generated_menu_cache = ResponseCache('generated_menu_json', expire=86400)
+
+# /api/edit results keyed by (image URL, instruction)
+edit_cache = ResponseCache('menu_edits', expire=86400)
+
+# Generated menus keyed by normalized prompt, then by prompt embedding, so
+# repeats skip the embedding call and near-duplicate prompts ("a burger
+# joint" / "burger place") skip the LLM round trip
+menu_cache = SemanticCache('menus', nvidia_client.embed, embed_many=nvidia_client.embed_many)
+
+# Most prompts accepted by /api/surprise/batch, and how many of them are
+# sent to the LLM at once
+SURPRISE_BATCH_LIMIT = 20
+SURPRISE_BATCH_CONCURRENCY = int(os.getenv('SURPRISE_BATCH_CONCURRENCY', '8'))
+
+# Identical requests that arrive while the first is still running wait for
+# its result instead of paying for a second LLM call / fal render
+menu_content_flights = SingleFlight()
+menu_render_flights = SingleFlight()
+
+
+def load_fal_client():
+    """Import fal_client on first use; it adds ~130 ms to every cold start."""
+    import fal_client
+    return fal_client
 
-# Initialize NVIDIA client wrapper
-nvidia_client = NvidiaClient()
+
+def get_fal():
+    """Shared fal AsyncClient, created on first use."""
+    global fal
+    if fal is None:
+        fal = load_fal_client().AsyncClient()
+    return fal
 
 
 def on_queue_update(update):
-    if isinstance(update, fal_client.InProgress):
+    if isinstance(update, load_fal_client().InProgress):
         for log in update.logs:
-            print(f"  └─ {log['message']}")
+            logger.info("  └─ %s", log['message'])
+
+
+def is_transient_fal_error(error):
+    """True for fal failures worth retrying: 429s, 5xx and dropped connections."""
+    if isinstance(error, load_fal_client().FalClientHTTPError):
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+def log_fal_retry(retry_state):
+    """Log a transient fal failure before backing off."""
+    logger.warning(
+        "⚠ fal request failed (%s). Retrying in %.1fs... (attempt %d)",
+        retry_state.outcome.exception(),
+        retry_state.next_action.sleep,
+        retry_state.attempt_number,
+    )
 
 
-def generate_food_image(food_name, description):
-    """Generate a realistic food image using fal.ai/beta-image-232."""
+# Full-jitter exponential backoff, so concurrent requests that hit the same
+# rate limit or outage don't retry in lockstep
+@retry(
+    stop=stop_after_attempt(4),
+    wait=wait_random_exponential(multiplier=1, max=30),
+    retry=retry_if_exception(is_transient_fal_error),
+    before_sleep=log_fal_retry,
+    reraise=True,
+)
+async def fal_subscribe(application, arguments, **kwargs):
+    """Run a fal job to completion, retrying transient failures."""
+    # Slot is taken per attempt, so backoff sleeps don't hold one
+    async with get_fal_slots():
+        if fal_webhooks is None:
+            return await get_fal().subscribe(application, arguments=arguments, **kwargs)
+
+        # Queue logs are only available by polling, so they're dropped here
+        handle = await get_fal().submit(application, arguments=arguments, webhook_url=fal_webhooks.url)
+        return await fal_webhooks.wait(handle)
+
+
+def get_fal_slots():
+    """Worker-wide fal job semaphore, created lazily so it binds to the shared loop."""
+    global fal_slots
+    if fal_slots is None:
+        fal_slots = asyncio.Semaphore(FAL_CONCURRENCY)
+    return fal_slots
+
+
+def food_image_prompt(food_name, description):
+    """Build the food photography prompt for a menu item."""
     prompt = f"Professional food photography of {food_name}"
     if description:
         prompt += f", {description}"
     prompt += ". High quality, appetizing, restaurant menu style, natural lighting, close-up shot, realistic"
+    return prompt
+
 
+def food_image_seed(prompt):
+    """Deterministic fal seed for a prompt, so a regenerated image matches the cached one."""
+    digest = hashlib.blake2b(prompt.encode(), digest_size=4).digest()
+    return int.from_bytes(digest, 'big') & 0x7FFFFFFF
+
+
+async def generate_food_images(items, on_image=None):
+    """Generate realistic food images with fal.ai/beta-image-232 for items that lack one.
+
+    Items are generated concurrently, at most FOOD_IMAGE_CONCURRENCY at a
+    time, so total wall time is close to one generation rather than the sum.
+    Sets item.image_url in place ("" on failure) and, if given, calls
+    on_image(index, item) as each one resolves.
+    """
+    # Created here so it binds to the shared loop
+    slots = asyncio.Semaphore(FOOD_IMAGE_CONCURRENCY)
+    await asyncio.gather(
+        *(resolve_food_image(index, item, slots, on_image) for index, item in enumerate(items))
+    )
+
+
+async def resolve_food_image(index, item, slots, on_image):
+    """Set one item's image_url, leaving "" on failure, and report it."""
     try:
-        print(f"  Generating image with prompt: {prompt[:100]}...")
-        result = fal_client.subscribe(
+        item.image_url = await generate_food_image(item, slots)
+    except Exception as e:
+        logger.error("  ✗ Error generating image for %s: %s", item.name, e)
+        # Leave an empty string so the item is treated as text-only
+        item.image_url = ""
+    if on_image:
+        on_image(index, item)
+
+
+async def generate_food_image(item, slots):
+    """Return an image URL for one item: provided, cached, or freshly generated."""
+    if item.image_url:
+        logger.info("Using provided image for: %s", item.name)
+        return item.image_url
+
+    food_name = item.name
+    prompt = food_image_prompt(food_name, item.description)
+    seed = food_image_seed(prompt)
+    cache_key = ResponseCache.make_key(prompt, seed)
+    cached_url = food_image_cache.get(cache_key)
+    if cached_url:
+        logger.info("  ✓ Cached image for %s: %s", food_name, cached_url)
+        return cached_url
+
+    # Identical items (in this request or a concurrent one) share one job
+    job = food_image_jobs.get(cache_key)
+    if job is None:
+        logger.info("Generating image for: %s", food_name)
+        job = asyncio.ensure_future(render_food_image(prompt, seed, cache_key, slots))
+        food_image_jobs[cache_key] = job
+        job.add_done_callback(lambda _: food_image_jobs.pop(cache_key, None))
+    # Shielded so one caller going away doesn't cancel the job for the others
+    return await asyncio.shield(job)
+
+
+async def render_food_image(prompt, seed, cache_key, slots):
+    """Run one food image job on fal and cache the resulting URL."""
+    async with slots:
+        logger.debug("  Submitting image with prompt: %.100s...", prompt)
+        result = await fal_subscribe(
             "fal-ai/beta-image-232",
-            arguments={
+            {
                 "prompt": prompt,
                 "image_size": "square",
-                "num_images": 1
+                "num_images": 1,
+                "seed": seed,
             },
-            with_logs=True,
-            on_queue_update=on_queue_update,
         )
 
-        image_url = result['images'][0]['url']
-        print(f"  ✓ Generated image: {image_url}")
-        return image_url
+    image_url = result['images'][0]['url']
+    logger.info("  ✓ Generated image: %s", image_url)
+    food_image_cache.set(cache_key, image_url)
+    return image_url
 
-    except Exception as e:
-        print(f"  ✗ Error generating image for {food_name}: {e}")
-        # Return a placeholder or empty string
-        return ""
+
+async def warm_fal_models():
+    """Send one tiny job to each fal endpoint so the first real request skips cold start."""
+    # The endpoints are independent, so warm them side by side; /edit must
+    # follow the base model because it reuses that job's output image
+    warmups = {
+        'text-to-image': warm_fal_endpoint("fal-ai/beta-image-232/text-to-image"),
+        'base + edit': warm_base_and_edit(),
+    }
+    results = await asyncio.gather(*warmups.values(), return_exceptions=True)
+    for name, result in zip(warmups, results):
+        if isinstance(result, BaseException):
+            logger.warning("⚠ fal warmup failed for %s: %s", name, result)
+        else:
+            logger.info("✓ fal %s warmed up", name)
+
+
+async def warm_fal_endpoint(application, **arguments):
+    """Run one minimal job on a fal endpoint and return its result."""
+    warmup_args = {"prompt": "warmup", "image_size": "square", "num_images": 1, **arguments}
+    handle = await get_fal().submit(application, arguments=warmup_args)
+    return await handle.get()
+
+
+async def warm_base_and_edit():
+    """Warm the base model, then /edit using the base output as its input image."""
+    result = await warm_fal_endpoint("fal-ai/beta-image-232")
+    await warm_fal_endpoint(
+        "fal-ai/beta-image-232/edit",
+        image_urls=[result['images'][0]['url']],
+    )
+
+
+# Warmup jobs are billed like real ones, so they are opt-in; run in the
+# background so startup never waits on them
+if os.getenv('FAL_WARMUP', '').lower() in ('1', 'true', 'yes'):
+    spawn(warm_fal_models())
 
 
 @app.route('/api/surprise', methods=['POST'])
 def surprise_me():
     """Generate menu content from simple prompt using AI."""
-    data = request.json
-    user_prompt = data.get('prompt', 'a burger joint')
+    user_prompt = decode_request(SurpriseRequest).prompt
 
     # Use fal.ai text generation or simple template for now
     # For simplicity, using a basic template generator
     # In production, you'd use an LLM here
 
-    menu_data = generate_menu_content(user_prompt)
+    with timed('llm'):
+        menu_data, shared = menu_content_flights.do(
+            normalize_prompt(user_prompt), generate_menu_content, user_prompt
+        )
+    if shared:
+        record('singleflight', 'shared')
 
     return jsonify(menu_data)
 
 
+@app.route('/api/surprise/batch', methods=['POST'])
+def surprise_me_batch():
+    """Generate menu content for several prompts in one request."""
+    prompts = decode_request(SurpriseBatchRequest).prompts
+
+    if not prompts:
+        return jsonify({'error': 'prompts must be a non-empty list of strings'}), 400
+    if len(prompts) > SURPRISE_BATCH_LIMIT:
+        return jsonify({'error': f'At most {SURPRISE_BATCH_LIMIT} prompts per batch'}), 400
+
+    with timed('llm'):
+        menus = generate_menu_batch(prompts)
+
+    return jsonify({'menus': menus})
+
+
+@app.route('/api/surprise/stream', methods=['POST'])
+def surprise_me_stream():
+    """Stream menu content as server-sent events while the LLM generates it."""
+    user_prompt = decode_request(SurpriseRequest).prompt
+
+    return Response(
+        stream_with_context(stream_menu_content(user_prompt)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
 @app.route('/api/generate', methods=['POST'])
 def generate_menu():
     """Generate menu image from menu items using FLUX.2 multi-image editing."""
-    data = request.json
-    restaurant_name = data.get('restaurantName', 'Restaurant')
-    items = data.get('items', [])
-    style = data.get('style', 'modern')
+    menu_request = decode_request(GenerateRequest)
+
+    # Identical requests (re-renders, retries) reuse the previous result
+    etag = menu_etag(menu_request)
+    cached_response = generated_menu_cache.get(etag)
+    if cached_response:
+        record('cache', 'hit')
+        if etag in request.if_none_match:
+            logger.info("✓ Menu unchanged, returning 304")
+            return '', 304, {'ETag': f'"{etag}"'}
+        logger.info("✓ Returning cached menu image")
+        return menu_response(cached_response, etag)
+
+    (response_body, complete), shared = menu_render_flights.do(etag, render_menu, menu_request, etag)
+    if shared:
+        record('singleflight', 'shared')
+
+    return menu_response(response_body, etag if complete else None)
+
+
+@app.route('/api/generate/stream', methods=['POST'])
+def generate_menu_stream():
+    """Stream /api/generate progress as server-sent events: each food image, then the menu."""
+    menu_request = decode_request(GenerateRequest)
+
+    return Response(
+        stream_with_context(stream_generated_menu(menu_request)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
 
-    print(f"Processing {len(items)} menu items...")
+
+def render_menu(menu_request, etag):
+    """Generate missing food images, compose the menu and cache it under etag.
+
+    Returns (response_body, complete); an incomplete menu (some food image
+    failed) is not cached, so retrying the request can fill the gap.
+    """
+    menu_items = menu_request.items
+    logger.info("Processing %d menu items...", len(menu_items))
+    record('n_items', len(menu_items))
 
     # Generate images for items that don't have them
-    food_image_urls = []
-    for item in items:
-        if not item.get('imageUrl'):
-            print(f"Generating image for: {item['name']}")
-            item['imageUrl'] = generate_food_image(item['name'], item.get('description', ''))
-        else:
-            print(f"Using provided image for: {item['name']}")
+    with timed('images'):
+        run_async(generate_food_images(menu_items))
+
+    response_body = compose_menu(menu_request)
+    complete = cache_if_complete(etag, menu_items, response_body)
+    return response_body, complete
+
+
+def cache_if_complete(etag, menu_items, response_body):
+    """Cache a composed menu only if every item got its food image; returns whether it did."""
+    if all(item.image_url for item in menu_items):
+        generated_menu_cache.set(etag, response_body)
+        return True
+    logger.warning("⚠️ Some food images failed, not caching this menu")
+    return False
 
-        # Collect image URLs for items that have them
-        if item.get('imageUrl'):
-            food_image_urls.append(item['imageUrl'])
+
+def compose_menu(menu_request):
+    """Render the final menu image once every item's food image is resolved; returns the JSON body."""
+    restaurant_name = menu_request.restaurant_name
+    menu_items = menu_request.items
+    style = menu_request.style
+
+    # Grouped once and shared by both prompt builders. The image prompt and
+    # its URL list come from one pass, so "image N" in the prompt is always
+    # image_urls[N - 1], even when categories are interleaved in the request
+    categories = group_by_category(menu_items)
+    prompt, food_image_urls = build_menu_prompt_with_images(restaurant_name, categories, style)
 
     # Check if we have any images to work with
     if not food_image_urls:
-        print("⚠️ No food images available, falling back to text-only generation")
-        prompt = build_menu_prompt(restaurant_name, items, style)
-        print(f"Generating menu with text-only prompt: {prompt[:200]}...")
-
-        result = fal_client.subscribe(
-            "fal-ai/beta-image-232/text-to-image",
-            arguments={"prompt": prompt},
-            with_logs=True,
-            on_queue_update=on_queue_update,
-        )
+        logger.warning("⚠️ No food images available, falling back to text-only generation")
+        prompt = build_menu_prompt(restaurant_name, categories, style)
+        logger.debug("Generating menu with text-only prompt: %.200s...", prompt)
+
+        with timed('menu'):
+            result = run_async(fal_subscribe(
+                "fal-ai/beta-image-232/text-to-image",
+                {"prompt": prompt},
+                with_logs=True,
+                on_queue_update=on_queue_update,
+            ))
         image_url = result['images'][0]['url']
     else:
         # Use FLUX.2 multi-image editing with explicit image references
-        print(f"🎨 Using FLUX.2 multi-image editing with {len(food_image_urls)} food images")
-        prompt = build_menu_prompt_with_images(restaurant_name, items, style)
-
-        print(f"Generating menu with multi-image prompt: {prompt[:200]}...")
-        print(f"Food image URLs: {food_image_urls[:3]}..." if len(food_image_urls) > 3 else f"Food image URLs: {food_image_urls}")
-
-        result = fal_client.subscribe(
-            "fal-ai/beta-image-232/edit",
-            arguments={
-                "image_urls": food_image_urls,
-                "prompt": prompt,
-            },
-            with_logs=True,
-            on_queue_update=on_queue_update,
-        )
+        logger.info("🎨 Using FLUX.2 multi-image editing with %d food images", len(food_image_urls))
+        logger.debug("Generating menu with multi-image prompt: %.200s...", prompt)
+        logger.debug("Food image URLs: %s", food_image_urls)
+
+        with timed('menu'):
+            result = run_async(fal_subscribe(
+                "fal-ai/beta-image-232/edit",
+                {
+                    "image_urls": food_image_urls,
+                    "prompt": prompt,
+                },
+                with_logs=True,
+                on_queue_update=on_queue_update,
+            ))
         image_url = result['images'][0]['url']
 
-    return jsonify({
+    # Encoded straight from the structs (with generated image URLs) in one
+    # pass; the bytes are cached and served as-is, never re-serialized
+    return msgspec.json.encode({
         'imageUrl': image_url,
         'prompt': prompt,
-        'items': items  # Return items with generated image URLs
+        'items': menu_items,
     })
 
 
+def stream_generated_menu(menu_request):
+    """Yield SSE events for a menu image: each food image as it finishes, then the result."""
+    try:
+        etag = menu_etag(menu_request)
+        cached_response = generated_menu_cache.get(etag)
+        if cached_response:
+            record('cache', 'hit')
+            yield sse_menu_event(cached_response)
+            return
+
+        menu_items = menu_request.items
+        record('n_items', len(menu_items))
+
+        # Images resolve on the shared loop; hand them to this thread as they land
+        images = queue.SimpleQueue()
+        with timed('images'):
+            future = spawn(generate_food_images(
+                menu_items,
+                on_image=lambda index, item: images.put((index, item.image_url)),
+            ))
+            future.add_done_callback(lambda _: images.put(None))
+            for index, image_url in iter(images.get, None):
+                yield sse_event({'type': 'image', 'index': index, 'imageUrl': image_url})
+            future.result()
+
+        response_body = compose_menu(menu_request)
+        cache_if_complete(etag, menu_items, response_body)
+        yield sse_menu_event(response_body)
+    except Exception as e:
+        logger.error("✗ Error streaming menu image generation: %s", e)
+        yield sse_event({'type': 'error', 'error': str(e)})
+    finally:
+        # after_request runs before a streamed body is sent, so log here
+        log_request_timing(200)
+
+
+def menu_etag(menu_request):
+    """Strong ETag over the canonicalized /api/generate request."""
+    # Struct fields encode in declaration order with defaults filled in,
+    # so equivalent bodies produce identical bytes
+    canonical = msgspec.json.encode(menu_request)
+    return hashlib.blake2b(canonical, digest_size=16).hexdigest()
+
+
+def menu_response(response_body, etag):
+    """JSON response for an encoded generated menu, with caching headers unless etag is None."""
+    response = app.response_class(response_body, mimetype='application/json')
+    if etag is None:
+        # Degraded result; let the client retry rather than reuse it
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, max-age=3600'
+    return response
+
+
 @app.route('/api/edit', methods=['POST'])
 def edit_menu():
     """Edit existing menu image."""
-    data = request.json
-    image_url = data.get('imageUrl')
-    edit_instruction = data.get('editInstruction')
-
-    print(f"Editing menu: {edit_instruction}")
-
-    result = fal_client.subscribe(
-        "fal-ai/beta-image-232/edit",
-        arguments={
-            "image_urls": [image_url],
-            "prompt": edit_instruction,
-        },
-        with_logs=True,
-        on_queue_update=on_queue_update,
-    )
+    edit_request = decode_request(EditRequest)
+    image_url = edit_request.image_url
+    edit_instruction = (edit_request.edit_instruction or '').strip()
+
+    # Nothing to change
+    if not edit_instruction:
+        return jsonify({'imageUrl': image_url})
+
+    # Repeated edit of the same image
+    cache_key = ResponseCache.make_key(image_url, edit_instruction)
+    cached_url = edit_cache.get(cache_key)
+    if cached_url:
+        logger.info("✓ Cached edit: %s", edit_instruction)
+        record('cache', 'hit')
+        return jsonify({'imageUrl': cached_url})
+
+    logger.info("Editing menu: %s", edit_instruction)
+
+    with timed('edit'):
+        result = run_async(fal_subscribe(
+            "fal-ai/beta-image-232/edit",
+            {
+                "image_urls": [image_url],
+                "prompt": edit_instruction,
+            },
+            with_logs=True,
+            on_queue_update=on_queue_update,
+        ))
 
     edited_url = result['images'][0]['url']
+    edit_cache.set(cache_key, edited_url)
 
     return jsonify({
         'imageUrl': edited_url
     })
 
 
+def decode_request(struct_type):
+    """Decode and validate the JSON body into struct_type in one pass, aborting with a 400 if it doesn't fit."""
+    try:
+        # Lax mode accepts numbers sent as strings ("12"), which LLM-written
+        # menus round-tripped through the frontend often contain
+        return msgspec.json.decode(request.get_data(), type=struct_type, strict=False)
+    except msgspec.DecodeError as e:
+        abort(make_response(jsonify({'error': f'Invalid request: {e}'}), 400))
+
+
+@app.route('/api/fal-webhook/<token>', methods=['POST'])
+def fal_webhook(token):
+    """Receive a finished fal job submitted with a webhook URL."""
+    if fal_webhooks is None or not fal_webhooks.authorize(token):
+        return jsonify({'error': 'Not found'}), 404
+
+    # The URL token ties the delivery to a job this deployment submitted;
+    # the signature proves fal sent it
+    body = request.get_data()
+    if not fal_webhooks.verify_signature(request.headers, body):
+        return jsonify({'error': 'Invalid signature'}), 401
+
+    delivery = request.get_json(silent=True)
+    if not isinstance(delivery, dict):
+        return jsonify({'error': 'Expected a JSON object'}), 400
+    request_id = delivery.get('request_id')
+    if not request_id or request_id != request.headers.get('X-Fal-Webhook-Request-Id'):
+        return jsonify({'error': 'Missing or mismatched request_id'}), 400
+
+    fal_webhooks.deliver(request_id, delivery)
+    return '', 204
+
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """Report hit/miss counters for the response caches."""
+    return jsonify({
+        'foodImages': food_image_cache.stats(),
+        'generatedMenus': generated_menu_cache.stats(),
+        'menuEdits': edit_cache.stats(),
+        'menus': menu_cache.stats()
+    })
+
+
 def generate_menu_content(user_prompt):
     """Generate menu content from user prompt using NVIDIA client."""
+    # Common concepts are served from the curated library, no model call
+    preset_menu = find_preset(user_prompt)
+    if preset_menu:
+        logger.info("✓ Using preset menu for: %s", user_prompt)
+        return preset_menu
+
     try:
-        return nvidia_client.generate_menu_json(user_prompt)
+        cached_menu, embedding = menu_cache.get(user_prompt)
+        if cached_menu:
+            return cached_menu
+
+        # Awaited on the shared loop, so the model round trip holds no extra thread
+        menu_data = run_async(nvidia_client.agenerate_menu_json(user_prompt))
+        if not nvidia_client.is_fallback_menu(menu_data):
+            menu_cache.put(user_prompt, embedding, menu_data)
+        return menu_data
     except Exception as e:
-        print(f"✗ Error in menu generation: {e}")
+        logger.error("✗ Error in menu generation: %s", e)
         # Client wrapper already handles fallback, but safety catch
-        return {
-            'restaurantName': 'The Restaurant',
-            'items': [
-                {'category': 'Appetizers', 'name': 'Soup of the Day', 'price': 6, 'description': 'Fresh daily soup'},
-                {'category': 'Main Course', 'name': 'Grilled Chicken', 'price': 16, 'description': 'Herb-marinated chicken breast'},
-                {'category': 'Desserts', 'name': 'Cheesecake', 'price': 7, 'description': 'Classic New York style'},
-            ]
-        }
-
-
-def build_menu_prompt(restaurant_name, items, style):
-    """Build detailed prompt for menu generation (legacy text-only method)."""
-
-    # Style mappings
-    style_descriptions = {
-        'modern': 'Modern clean design, minimalist, sharp typography, high contrast',
-        'vintage': 'Vintage rustic style, chalkboard aesthetic, hand-drawn feel, warm colors',
-        'elegant': 'Elegant upscale design, sophisticated fonts, gold accents, luxury feel',
-        'casual': 'Casual friendly design, bright colors, fun fonts, approachable layout',
+        return default_menu()
+
+
+def generate_menu_batch(user_prompts):
+    """Generate menus for several prompts, sending only preset and cache misses to the LLM together."""
+    # Repeated prompts are looked up and generated once
+    unique_prompts = list({normalize_prompt(user_prompt): user_prompt for user_prompt in user_prompts}.values())
+    menus = [find_preset(user_prompt) for user_prompt in unique_prompts]
+
+    # Every non-preset prompt is embedded in one request rather than one each
+    lookups = [index for index, menu_data in enumerate(menus) if menu_data is None]
+    misses = []
+    for index, (menu_data, embedding) in zip(lookups, menu_cache.get_many([unique_prompts[i] for i in lookups])):
+        menus[index] = menu_data
+        if menu_data is None:
+            misses.append((index, unique_prompts[index], embedding))
+
+    if misses:
+        try:
+            generated = run_async(nvidia_client.abatch_menu_json(
+                [user_prompt for _, user_prompt, _ in misses], concurrency=SURPRISE_BATCH_CONCURRENCY
+            ))
+        except Exception as e:
+            logger.error("✗ Error in batch menu generation: %s", e)
+            generated = [default_menu() for _ in misses]
+
+        for (index, user_prompt, embedding), menu_data in zip(misses, generated):
+            if not nvidia_client.is_fallback_menu(menu_data):
+                menu_cache.put(user_prompt, embedding, menu_data)
+            menus[index] = menu_data
+
+    by_prompt = {normalize_prompt(user_prompt): menu_data for user_prompt, menu_data in zip(unique_prompts, menus)}
+    return [by_prompt[normalize_prompt(user_prompt)] for user_prompt in user_prompts]
+
+
+def stream_menu_content(user_prompt):
+    """Yield SSE events for a menu: the name and each item as they complete, then the full menu."""
+    try:
+        preset_menu = find_preset(user_prompt)
+        if preset_menu:
+            logger.info("✓ Using preset menu for: %s", user_prompt)
+            yield sse_event({'type': 'done', 'menu': preset_menu})
+            return
+
+        cached_menu, embedding = menu_cache.get(user_prompt)
+        if cached_menu:
+            yield sse_event({'type': 'done', 'menu': cached_menu})
+            return
+
+        parser = MenuStreamParser()
+        menu_data = None
+        # Plain locals, so the per-token loop never goes through the g proxy
+        seen_token = seen_item = False
+
+        try:
+            for delta in nvidia_client.stream_menu_text(user_prompt):
+                if not seen_token:
+                    seen_token = True
+                    record('ttft_ms', elapsed_ms())
+                for event, value in parser.feed(delta):
+                    if event == 'item' and not seen_item:
+                        seen_item = True
+                        record('first_item_ms', elapsed_ms())
+                    yield sse_event({'type': event, event: value})
+
+            menu_data = nvidia_client.parse_menu_response(parser.text)
+        except Exception as e:
+            logger.error("✗ Error streaming menu generation: %s", e)
+
+        if menu_data is None:
+            logger.warning("⚠ Streamed menu was invalid, using fallback")
+            menu_data = default_menu()
+        else:
+            menu_cache.put(user_prompt, embedding, menu_data)
+
+        yield sse_event({'type': 'done', 'menu': menu_data})
+    finally:
+        # after_request runs before a streamed body is sent, so log here
+        log_request_timing(200)
+
+
+def sse_event(payload):
+    """Format a payload as a server-sent event."""
+    return f"data: {app.json.dumps(payload)}\n\n"
+
+
+def sse_menu_event(response_body):
+    """Format the final generated menu event around its already-encoded JSON body."""
+    return b'data: {"type":"done","menu":' + response_body + b'}\n\n'
+
+
+def default_menu():
+    """Basic menu returned when content generation fails."""
+    return {
+        'restaurantName': 'The Restaurant',
+        'items': [
+            {'category': 'Appetizers', 'name': 'Soup of the Day', 'price': 6, 'description': 'Fresh daily soup'},
+            {'category': 'Main Course', 'name': 'Grilled Chicken', 'price': 16, 'description': 'Herb-marinated chicken breast'},
+            {'category': 'Desserts', 'name': 'Cheesecake', 'price': 7, 'description': 'Classic New York style'},
+        ]
     }
 
-    style_desc = style_descriptions.get(style, style_descriptions['modern'])
 
-    # Group items by category
-    categories = {}
+# Only scalar fields, so it can never be part of a reference cycle; gc=False
+# keeps per-item allocations out of the cyclic garbage collector
+class MenuItem(msgspec.Struct, rename='camel', gc=False):
+    """Menu item as sent by the frontend (imageUrl on the wire, image_url here).
+
+    Items usually come from a generated menu, which the model may fill
+    with null fields or free-form prices ("$12"); those are accepted as
+    they are so the Surprise Me -> Generate flow never fails on them.
+    """
+    name: Optional[str] = ''
+    price: Union[int, float, str, None] = 0
+    description: Optional[str] = ''
+    image_url: Optional[str] = ''
+    category: Optional[str] = 'Items'
+
+    def __post_init__(self):
+        # null means "not given"; the prompt builders expect strings
+        if self.name is None:
+            self.name = ''
+        if self.price is None:
+            self.price = 0
+        if self.description is None:
+            self.description = ''
+        if self.image_url is None:
+            self.image_url = ''
+        if self.category is None:
+            self.category = 'Items'
+
+
+class GenerateRequest(msgspec.Struct, rename='camel'):
+    """Validated /api/generate request body."""
+    restaurant_name: str = 'Restaurant'
+    items: List[MenuItem] = []
+    style: str = 'modern'
+
+
+class SurpriseRequest(msgspec.Struct):
+    """Validated /api/surprise and /api/surprise/stream request body."""
+    prompt: str = 'a burger joint'
+
+
+class SurpriseBatchRequest(msgspec.Struct):
+    """Validated /api/surprise/batch request body."""
+    prompts: List[str]
+
+
+class EditRequest(msgspec.Struct, rename='camel'):
+    """Validated /api/edit request body."""
+    image_url: str
+    edit_instruction: Optional[str] = ''
+
+
+# Style mappings shared by both menu prompt builders
+STYLE_DESCRIPTIONS = {
+    'modern': 'Modern clean design, minimalist, sharp typography, high contrast',
+    'vintage': 'Vintage rustic style, chalkboard aesthetic, hand-drawn feel, warm colors',
+    'elegant': 'Elegant upscale design, sophisticated fonts, gold accents, luxury feel',
+    'casual': 'Casual friendly design, bright colors, fun fonts, approachable layout',
+}
+
+# Closing instructions for each prompt builder, rendered once per style
+TEXT_PROMPT_ENDINGS = {
+    style: f"\n{desc}. Include space for food photographs next to items. Sharp, crisp, highly readable text. Clear prices. Professional layout with image placeholders."
+    for style, desc in STYLE_DESCRIPTIONS.items()
+}
+IMAGE_PROMPT_ENDINGS = {
+    style: f"\n{desc}. Arrange food photographs elegantly with their names, prices, and descriptions. Sharp, crisp, highly readable text. Professional layout with proper spacing between items."
+    for style, desc in STYLE_DESCRIPTIONS.items()
+}
+
+
+def group_by_category(items):
+    """Group MenuItems by category, keeping first-seen category and item order."""
+    categories = defaultdict(list)
     for item in items:
-        cat = item.get('category', 'Items')
-        if cat not in categories:
-            categories[cat] = []
-        categories[cat].append(item)
+        categories[item.category].append(item)
+    return categories
+
+
+def build_menu_prompt(restaurant_name, categories, style):
+    """Build detailed prompt for menu generation (legacy text-only method) from grouped MenuItems."""
 
-    # Build prompt
-    prompt = f"Professional restaurant menu for '{restaurant_name}' with food photography layout.\n\n"
+    # Build prompt from parts (joined once at the end)
+    parts = [f"Professional restaurant menu for '{restaurant_name}' with food photography layout.\n\n"]
 
     for category, cat_items in categories.items():
-        prompt += f"{category.upper()}:\n"
+        parts.append(f"{category.upper()}:\n")
         for item in cat_items:
-            name = item.get('name', '')
-            price = item.get('price', 0)
-            desc = item.get('description', '')
-            has_image = bool(item.get('imageUrl'))
+            name, price, desc = item.name, item.price, item.description
 
-            prompt += f"- {name} ${price}"
+            parts.append(f"- {name} ${price}")
             if desc:
-                prompt += f" - {desc}"
-            if has_image:
-                prompt += " [with food photo]"
-            prompt += "\n"
-        prompt += "\n"
+                parts.append(f" - {desc}")
+            if item.image_url:
+                parts.append(" [with food photo]")
+            parts.append("\n")
+        parts.append("\n")
 
-    prompt += f"\n{style_desc}. Include space for food photographs next to items. Sharp, crisp, highly readable text. Clear prices. Professional layout with image placeholders."
-
-    return prompt
+    parts.append(TEXT_PROMPT_ENDINGS.get(style, TEXT_PROMPT_ENDINGS['modern']))
 
+    return "".join(parts)
 
-def build_menu_prompt_with_images(restaurant_name, items, style):
-    """Build FLUX.2 multi-image prompt using explicit image references."""
-
-    # Style mappings
-    style_descriptions = {
-        'modern': 'Modern clean design, minimalist, sharp typography, high contrast',
-        'vintage': 'Vintage rustic style, chalkboard aesthetic, hand-drawn feel, warm colors',
-        'elegant': 'Elegant upscale design, sophisticated fonts, gold accents, luxury feel',
-        'casual': 'Casual friendly design, bright colors, fun fonts, approachable layout',
-    }
 
-    style_desc = style_descriptions.get(style, style_descriptions['modern'])
-
-    # Group items by category
-    categories = {}
-    for item in items:
-        cat = item.get('category', 'Items')
-        if cat not in categories:
-            categories[cat] = []
-        categories[cat].append(item)
+def build_menu_prompt_with_images(restaurant_name, categories, style):
+    """Build FLUX.2 multi-image prompt from grouped MenuItems, returning (prompt, image_urls) in reference order."""
 
     # Build prompt with explicit image references (1-based indexing)
-    prompt = f"Professional restaurant menu layout for '{restaurant_name}'.\n\n"
+    parts = [f"Professional restaurant menu layout for '{restaurant_name}'.\n\n"]
 
-    image_index = 1
+    image_urls = []
     for category, cat_items in categories.items():
-        prompt += f"{category.upper()}:\n"
+        parts.append(f"{category.upper()}:\n")
         for item in cat_items:
-            name = item.get('name', '')
-            price = item.get('price', 0)
-            desc = item.get('description', '')
-            has_image = bool(item.get('imageUrl'))
+            name, price, desc = item.name, item.price, item.description
 
-            if has_image:
+            if item.image_url:
                 # Use explicit image reference for FLUX.2
-                prompt += f"- Place image {image_index} with minimal edits; {name}, ${price} with description: \"{desc}\"\n"
-                image_index += 1
+                image_urls.append(item.image_url)
+                parts.append(f"- Place image {len(image_urls)} with minimal edits; {name}, ${price} with description: \"{desc}\"\n")
             else:
                 # Text-only item
-                prompt += f"- {name} ${price}"
+                parts.append(f"- {name} ${price}")
                 if desc:
-                    prompt += f" - {desc}"
-                prompt += "\n"
-        prompt += "\n"
+                    parts.append(f" - {desc}")
+                parts.append("\n")
+        parts.append("\n")
 
-    prompt += f"\n{style_desc}. Arrange food photographs elegantly with their names, prices, and descriptions. Sharp, crisp, highly readable text. Professional layout with proper spacing between items."
+    parts.append(IMAGE_PROMPT_ENDINGS.get(style, IMAGE_PROMPT_ENDINGS['modern']))
 
-    return prompt
+    return "".join(parts), image_urls
 
 
 if __name__ == '__main__':
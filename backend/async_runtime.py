@@ -0,0 +1,45 @@
+"""
+Shared asyncio event loop for outbound network I/O
+Synchronous Flask handlers hand coroutines to one long-lived background loop
+"""
+
+from concurrent.futures import Future
+from typing import Any, Awaitable, Optional, TypeVar
+import asyncio
+import threading
+
+
+T = TypeVar('T')
+
+# One loop per process: async clients (fal, AsyncOpenAI) bind their pooled
+# connections to the loop they first run on, so every coroutine must run here
+_loop = asyncio.new_event_loop()
+_thread = threading.Thread(target=_loop.run_forever, name='async-io', daemon=True)
+_thread.start()
+
+
+def run_async(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """
+    Run a coroutine on the shared loop and wait for its result.
+
+    Args:
+        coro: Coroutine to run
+        timeout: Optional number of seconds to wait before raising TimeoutError
+
+    Returns:
+        The coroutine's return value (its exception is re-raised here)
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result(timeout)
+
+
+def spawn(coro: Awaitable[Any]) -> Future:
+    """
+    Schedule a coroutine on the shared loop without waiting for it.
+
+    Args:
+        coro: Coroutine to run in the background
+
+    Returns:
+        Future that resolves when the coroutine finishes
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _loop)
@@ -0,0 +1,152 @@
+"""
+Keyed response cache for expensive AI calls
+Keeps a small in-process LRU in front of a persistent disk cache
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import atexit
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+
+import diskcache
+
+
+logger = logging.getLogger(__name__)
+
+# Root directory for all on-disk caches (override with CACHE_DIR)
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(tempfile.gettempdir(), "menu_creator_cache"))
+
+# Background writer so persistence never delays a response; pending
+# writes are flushed on interpreter shutdown
+_CACHE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-writer")
+atexit.register(_CACHE_POOL.shutdown, wait=True)
+
+
+def defer_write(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+    """
+    Run a cache write on the background writer pool.
+
+    Args:
+        fn: Write function to call
+        *args: Positional arguments for fn
+        **kwargs: Keyword arguments for fn
+    """
+    future = _CACHE_POOL.submit(fn, *args, **kwargs)
+    future.add_done_callback(_report_write_error)
+
+
+def _report_write_error(future) -> None:
+    """Log failures from deferred writes, which would otherwise be silent"""
+    error = future.exception()
+    if error is not None:
+        logger.warning("⚠ Cache write failed: %s", error)
+
+
+class ResponseCache:
+    """Two-level (memory + disk) cache with hit/miss accounting"""
+
+    def __init__(self, name: str, memory_size: int = 1024, expire: int = 7 * 86400):
+        """
+        Initialize cache.
+
+        Args:
+            name: Sub-directory of CACHE_DIR used for persistence
+            memory_size: Maximum number of entries kept in memory
+            expire: Default time-to-live for disk entries, in seconds
+        """
+        self.name = name
+        self.memory_size = memory_size
+        self.expire = expire
+
+        self._disk = diskcache.Cache(os.path.join(CACHE_DIR, name))
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Build a stable cache key from the given parts.
+
+        Args:
+            *parts: Values identifying the cached response
+
+        Returns:
+            Hex digest of the joined parts
+        """
+        raw = "|".join(str(part) for part in parts)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value, checking memory before disk.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+        value = self._disk.get(key)
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, value)
+        return value
+
+    def set(self, key: str, value: Any, expire: Optional[int] = None) -> None:
+        """
+        Store a value in memory now and on disk in the background.
+
+        Empty values (failed generations) are never cached.
+
+        Args:
+            key: Cache key from make_key()
+            value: Value to store
+            expire: Optional time-to-live override, in seconds
+        """
+        if not value:
+            return
+
+        with self._lock:
+            self._remember(key, value)
+        defer_write(self._disk.set, key, value, expire=expire or self.expire)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters for this cache.
+
+        Returns:
+            Dictionary with hits, misses, hitRate and size
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRate': round(self.hits / total, 3) if total else 0.0,
+                'size': len(self._disk),
+            }
+
+    def _remember(self, key: str, value: Any) -> None:
+        """Insert into the in-process LRU (caller holds the lock)"""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
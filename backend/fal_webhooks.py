@@ -0,0 +1,210 @@
+"""
+fal.ai webhook delivery
+Jobs submitted with a webhook URL are resolved when fal POSTs the result, not by polling
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+import asyncio
+import base64
+import hashlib
+import hmac
+import importlib.util
+import logging
+import threading
+import time
+
+import httpx
+
+from cache import ResponseCache
+
+
+logger = logging.getLogger(__name__)
+
+# fal signs every webhook with ED25519; these are its published public keys
+_JWKS_URL = "https://rest.alpha.fal.ai/.well-known/jwks.json"
+_JWKS_TTL = 86400  # seconds
+# Deliveries whose signed timestamp is further off than this are rejected
+_TIMESTAMP_TOLERANCE = 300  # seconds
+
+# Signature checks need PyNaCl; without it webhooks stay disabled
+SIGNATURES_AVAILABLE = importlib.util.find_spec("nacl") is not None
+
+
+class FalWebhooks:
+    """Match fal webhook deliveries to the coroutines waiting on them"""
+
+    def __init__(self, public_url: str, secret: str, results: ResponseCache,
+                 recheck_interval: float = 2.0, timeout: float = 300.0):
+        """
+        Initialize webhook routing.
+
+        Args:
+            public_url: Externally reachable base URL of this server
+            secret: Token embedded in the webhook URL to authenticate fal
+            results: Cache shared by every worker process, since fal may
+                deliver to a different worker than the one waiting
+            recheck_interval: Seconds between checks of the shared cache
+            timeout: Seconds to wait for a delivery before polling fal
+        """
+        self.url = f"{public_url.rstrip('/')}/api/fal-webhook/{secret}"
+        self.recheck_interval = recheck_interval
+        self.timeout = timeout
+
+        self._secret = secret.encode()
+        self._results = results
+        self._waiters: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        self._lock = threading.Lock()
+
+        self._verify_keys: List[Any] = []
+        self._verify_keys_expire = 0.0
+        self._keys_lock = threading.Lock()
+
+    @staticmethod
+    def derive_secret(fal_key: str) -> str:
+        """
+        Derive a stable webhook token from the fal API key.
+
+        Args:
+            fal_key: fal.ai API key
+
+        Returns:
+            Hex token that is identical across workers but reveals nothing about the key
+        """
+        return hashlib.blake2b(fal_key.encode(), digest_size=16, person=b'fal-webhook').hexdigest()
+
+    def authorize(self, token: str) -> bool:
+        """Check the token from an incoming webhook URL"""
+        # Bytes, since compare_digest refuses non-ASCII str
+        return hmac.compare_digest(token.encode(), self._secret)
+
+    def verify_signature(self, headers: Mapping[str, str], body: bytes) -> bool:
+        """
+        Check fal's ED25519 signature on a webhook delivery.
+
+        fal signs the request ID, user ID, timestamp and SHA-256 of the body
+        with one of the keys published at _JWKS_URL.
+
+        Args:
+            headers: Request headers
+            body: Raw request body
+
+        Returns:
+            True if the signature is valid and its timestamp is recent
+        """
+        request_id = headers.get('X-Fal-Webhook-Request-Id')
+        user_id = headers.get('X-Fal-Webhook-User-Id')
+        timestamp = headers.get('X-Fal-Webhook-Timestamp')
+        signature = headers.get('X-Fal-Webhook-Signature')
+        if not (request_id and user_id and timestamp and signature):
+            return False
+
+        try:
+            if abs(time.time() - int(timestamp)) > _TIMESTAMP_TOLERANCE:
+                return False
+            signature_bytes = bytes.fromhex(signature)
+        except ValueError:
+            return False
+
+        from nacl.exceptions import BadSignatureError
+
+        message = "\n".join([request_id, user_id, timestamp, hashlib.sha256(body).hexdigest()]).encode()
+        for key in self._get_verify_keys():
+            try:
+                key.verify(message, signature_bytes)
+                return True
+            except (BadSignatureError, ValueError):
+                continue
+        return False
+
+    def _get_verify_keys(self) -> List[Any]:
+        """fal's webhook verify keys, fetched once a day (kept on fetch failure)"""
+        with self._keys_lock:
+            if time.time() < self._verify_keys_expire:
+                return self._verify_keys
+
+            from nacl.signing import VerifyKey
+
+            try:
+                response = httpx.get(_JWKS_URL, timeout=10.0)
+                response.raise_for_status()
+                keys = []
+                for jwk in response.json().get('keys', []):
+                    x = jwk.get('x', '')
+                    keys.append(VerifyKey(base64.urlsafe_b64decode(x + '=' * (-len(x) % 4))))
+            except Exception as e:
+                logger.warning("⚠ Could not fetch fal webhook keys: %s", e)
+                # Retry soon rather than on every delivery
+                self._verify_keys_expire = time.time() + 60
+                return self._verify_keys
+
+            self._verify_keys = keys
+            self._verify_keys_expire = time.time() + _JWKS_TTL
+            return keys
+
+    async def wait(self, handle: Any) -> Any:
+        """
+        Wait for the webhook of a submitted fal job.
+
+        Args:
+            handle: AsyncRequestHandle returned by fal submit()
+
+        Returns:
+            The job result, as subscribe() would return it
+
+        Raises:
+            RuntimeError: If fal reports that the job failed
+        """
+        request_id = handle.request_id
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            self._waiters[request_id] = (loop, future)
+
+        try:
+            deadline = loop.time() + self.timeout
+            while loop.time() < deadline:
+                # Covers deliveries that landed on another worker, or
+                # arrived here before the waiter was registered. The cache
+                # may read from disk, so keep it off the shared loop
+                delivery = await loop.run_in_executor(None, self._results.get, request_id)
+                if delivery is None:
+                    try:
+                        delivery = await asyncio.wait_for(asyncio.shield(future), self.recheck_interval)
+                    except asyncio.TimeoutError:
+                        continue
+                return self._unwrap(request_id, delivery)
+        finally:
+            with self._lock:
+                self._waiters.pop(request_id, None)
+
+        logger.warning("⚠ No fal webhook for %s after %.0fs, polling instead", request_id, self.timeout)
+        return await handle.get(interval=1.0)
+
+    def deliver(self, request_id: str, delivery: Dict[str, Any]) -> None:
+        """
+        Record a webhook delivery and wake its waiter, if it is in this process.
+
+        Args:
+            request_id: fal request ID from the delivery
+            delivery: Webhook body (request_id, status, payload, error)
+        """
+        self._results.set(request_id, delivery)
+
+        with self._lock:
+            waiter = self._waiters.get(request_id)
+        if waiter is not None:
+            loop, future = waiter
+            loop.call_soon_threadsafe(self._resolve, future, delivery)
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, delivery: Dict[str, Any]) -> None:
+        """Complete a waiter future on its own loop"""
+        if not future.done():
+            future.set_result(delivery)
+
+    @staticmethod
+    def _unwrap(request_id: str, delivery: Dict[str, Any]) -> Optional[Any]:
+        """Return the job result from a delivery, raising if the job failed"""
+        if delivery.get('status') != 'OK':
+            raise RuntimeError(f"fal job {request_id} failed: {delivery.get('error') or delivery.get('payload')}")
+        return delivery.get('payload')
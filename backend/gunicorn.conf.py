@@ -0,0 +1,19 @@
+"""
+Gunicorn configuration for production deployments
+Run with: gunicorn -c gunicorn.conf.py app:app
+"""
+
+import os
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5001')}"
+
+# Requests spend nearly all their time waiting on fal.ai / NVIDIA over the
+# network, so use threaded workers: each process serves many in-flight
+# generations instead of one per worker process.
+worker_class = "gthread"
+workers = int(os.getenv("GUNICORN_WORKERS", "4"))
+threads = int(os.getenv("GUNICORN_THREADS", "32"))
+
+# Menu generation can take 30s+ end to end
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "180"))
+keepalive = 5
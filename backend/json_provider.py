@@ -0,0 +1,29 @@
+"""
+orjson-backed JSON provider for Flask
+Speeds up request parsing and jsonify() without changing route code
+"""
+
+from typing import Any, Union
+
+from flask.json.provider import JSONProvider
+import orjson
+
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider that serializes and parses with orjson"""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize obj to a JSON string"""
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        """Parse a JSON string or bytes"""
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        """Build a JSON response without round-tripping through str"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS),
+            mimetype="application/json"
+        )
@@ -0,0 +1,40 @@
+"""
+Logging setup for the backend
+Request threads enqueue records; a single listener thread does the stream I/O
+"""
+
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import logging
+import os
+import queue
+
+
+LOG_FORMAT = '%(asctime)s %(levelname)s %(message)s'
+
+
+def configure_logging() -> None:
+    """
+    Route root logging through a non-blocking QueueHandler.
+
+    The level comes from LOG_LEVEL (default INFO). Records are formatted
+    and written to stderr by a background QueueListener, so request
+    threads never wait on the stream lock.
+    """
+    root = logging.getLogger()
+    if any(isinstance(handler, QueueHandler) for handler in root.handlers):
+        return
+
+    level = os.getenv('LOG_LEVEL', 'INFO').upper()
+    logging.basicConfig(level=level, format=LOG_FORMAT)
+
+    stream_handlers = list(root.handlers)
+    for handler in stream_handlers:
+        root.removeHandler(handler)
+
+    log_queue = queue.SimpleQueue()
+    root.addHandler(QueueHandler(log_queue))
+
+    listener = QueueListener(log_queue, *stream_handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
@@ -0,0 +1,275 @@
+"""
+Hand-curated menus for common Surprise Me concepts
+Generic prompts ("burger joint", "sushi") are answered without calling the LLM
+"""
+
+from typing import Any, Dict, Optional
+import copy
+import difflib
+import re
+
+
+# Canonical menus keyed by normalized concept
+MENU_PRESETS = {
+    'burger joint': {
+        'restaurantName': 'Stack & Smash Burgers',
+        'items': [
+            {'category': 'Burgers', 'name': 'Classic Smash Burger', 'price': 11, 'description': 'Double smashed patties, American cheese, pickles, house sauce'},
+            {'category': 'Burgers', 'name': 'Bacon BBQ Burger', 'price': 13, 'description': 'Crispy bacon, cheddar, onion rings, smoky barbecue sauce'},
+            {'category': 'Sides', 'name': 'Hand-Cut Fries', 'price': 4, 'description': 'Twice-fried russet potatoes with sea salt'},
+            {'category': 'Drinks', 'name': 'Vanilla Milkshake', 'price': 6, 'description': 'Thick and creamy, topped with whipped cream'},
+        ]
+    },
+    'pizzeria': {
+        'restaurantName': 'Brick Oven Slice Co.',
+        'items': [
+            {'category': 'Pizzas', 'name': 'Margherita', 'price': 14, 'description': 'San Marzano tomato, fresh mozzarella, basil, olive oil'},
+            {'category': 'Pizzas', 'name': 'Pepperoni', 'price': 16, 'description': 'Cup-and-char pepperoni with aged mozzarella'},
+            {'category': 'Appetizers', 'name': 'Garlic Knots', 'price': 6, 'description': 'Buttery knots with garlic, parsley and parmesan'},
+            {'category': 'Desserts', 'name': 'Cannoli', 'price': 5, 'description': 'Crisp shell filled with sweet ricotta and chocolate chips'},
+        ]
+    },
+    'italian': {
+        'restaurantName': 'Trattoria Nonna Rosa',
+        'items': [
+            {'category': 'Appetizers', 'name': 'Bruschetta', 'price': 8, 'description': 'Grilled bread with tomatoes, garlic and basil'},
+            {'category': 'Main Course', 'name': 'Spaghetti Carbonara', 'price': 18, 'description': 'Guanciale, egg yolk, pecorino and black pepper'},
+            {'category': 'Main Course', 'name': 'Chicken Parmigiana', 'price': 20, 'description': 'Breaded cutlet with marinara and melted mozzarella'},
+            {'category': 'Desserts', 'name': 'Tiramisu', 'price': 8, 'description': 'Espresso-soaked ladyfingers layered with mascarpone'},
+        ]
+    },
+    'sushi': {
+        'restaurantName': 'Sakura Sushi Bar',
+        'items': [
+            {'category': 'Appetizers', 'name': 'Edamame', 'price': 5, 'description': 'Steamed soybeans with flaky sea salt'},
+            {'category': 'Rolls', 'name': 'Spicy Tuna Roll', 'price': 9, 'description': 'Tuna, spicy mayo, cucumber and sesame'},
+            {'category': 'Rolls', 'name': 'Dragon Roll', 'price': 14, 'description': 'Shrimp tempura topped with avocado and eel sauce'},
+            {'category': 'Nigiri', 'name': 'Salmon Nigiri', 'price': 7, 'description': 'Two pieces of fresh salmon over seasoned rice'},
+        ]
+    },
+    'mexican': {
+        'restaurantName': 'Casa del Sol Cantina',
+        'items': [
+            {'category': 'Appetizers', 'name': 'Guacamole & Chips', 'price': 8, 'description': 'Fresh avocado, lime, cilantro and warm tortilla chips'},
+            {'category': 'Main Course', 'name': 'Carne Asada Tacos', 'price': 13, 'description': 'Grilled steak, onion, cilantro and salsa verde'},
+            {'category': 'Main Course', 'name': 'Chicken Enchiladas', 'price': 15, 'description': 'Corn tortillas in red chile sauce with queso fresco'},
+            {'category': 'Desserts', 'name': 'Churros', 'price': 6, 'description': 'Cinnamon sugar churros with chocolate dipping sauce'},
+        ]
+    },
+    'taco truck': {
+        'restaurantName': 'Wheels of Fortune Tacos',
+        'items': [
+            {'category': 'Tacos', 'name': 'Al Pastor Taco', 'price': 4, 'description': 'Marinated pork with pineapple, onion and cilantro'},
+            {'category': 'Tacos', 'name': 'Baja Fish Taco', 'price': 5, 'description': 'Beer-battered fish, cabbage slaw and chipotle crema'},
+            {'category': 'Sides', 'name': 'Elote', 'price': 4, 'description': 'Street corn with mayo, cotija, chile and lime'},
+            {'category': 'Drinks', 'name': 'Horchata', 'price': 3, 'description': 'Sweet cinnamon rice milk over ice'},
+        ]
+    },
+    'coffee shop': {
+        'restaurantName': 'Daily Grind Coffee House',
+        'items': [
+            {'category': 'Coffee', 'name': 'Cappuccino', 'price': 4, 'description': 'Double espresso with velvety steamed milk foam'},
+            {'category': 'Coffee', 'name': 'Cold Brew', 'price': 5, 'description': 'Slow-steeped for 18 hours, smooth and bold'},
+            {'category': 'Pastries', 'name': 'Butter Croissant', 'price': 3, 'description': 'Flaky, golden and baked fresh every morning'},
+            {'category': 'Pastries', 'name': 'Blueberry Muffin', 'price': 3, 'description': 'Bursting with blueberries and a crumb topping'},
+        ]
+    },
+    'bakery': {
+        'restaurantName': 'Rise & Shine Bakery',
+        'items': [
+            {'category': 'Breads', 'name': 'Country Sourdough', 'price': 8, 'description': 'Naturally leavened loaf with a crackling crust'},
+            {'category': 'Pastries', 'name': 'Almond Croissant', 'price': 5, 'description': 'Filled with frangipane and topped with toasted almonds'},
+            {'category': 'Pastries', 'name': 'Cinnamon Roll', 'price': 4, 'description': 'Soft swirled dough with cream cheese icing'},
+            {'category': 'Cakes', 'name': 'Lemon Drizzle Slice', 'price': 4, 'description': 'Moist lemon sponge with a tangy glaze'},
+        ]
+    },
+    'steakhouse': {
+        'restaurantName': 'The Prime Cut',
+        'items': [
+            {'category': 'Appetizers', 'name': 'Shrimp Cocktail', 'price': 16, 'description': 'Chilled jumbo shrimp with horseradish cocktail sauce'},
+            {'category': 'Main Course', 'name': 'Ribeye Steak', 'price': 45, 'description': '16oz dry-aged ribeye with herb butter'},
+            {'category': 'Sides', 'name': 'Creamed Spinach', 'price': 9, 'description': 'Rich and garlicky with a touch of nutmeg'},
+            {'category': 'Desserts', 'name': 'Chocolate Lava Cake', 'price': 12, 'description': 'Warm molten center with vanilla ice cream'},
+        ]
+    },
+    'bbq': {
+        'restaurantName': 'Low & Slow Smokehouse',
+        'items': [
+            {'category': 'Main Course', 'name': 'Smoked Brisket', 'price': 22, 'description': 'Texas-style brisket smoked over post oak for 14 hours'},
+            {'category': 'Main Course', 'name': 'Baby Back Ribs', 'price': 24, 'description': 'Dry-rubbed and glazed with tangy barbecue sauce'},
+            {'category': 'Sides', 'name': 'Mac & Cheese', 'price': 6, 'description': 'Baked three-cheese macaroni with a crispy top'},
+            {'category': 'Sides', 'name': 'Cornbread', 'price': 4, 'description': 'Skillet cornbread with honey butter'},
+        ]
+    },
+    'indian': {
+        'restaurantName': 'Spice Route Kitchen',
+        'items': [
+            {'category': 'Appetizers', 'name': 'Vegetable Samosas', 'price': 7, 'description': 'Crispy pastries stuffed with spiced potatoes and peas'},
+            {'category': 'Main Course', 'name': 'Butter Chicken', 'price': 18, 'description': 'Tandoori chicken in a creamy tomato sauce'},
+            {'category': 'Main Course', 'name': 'Chana Masala', 'price': 15, 'description': 'Chickpeas simmered with onion, tomato and garam masala'},
+            {'category': 'Sides', 'name': 'Garlic Naan', 'price': 4, 'description': 'Tandoor-baked flatbread brushed with garlic butter'},
+        ]
+    },
+    'thai': {
+        'restaurantName': 'Bangkok Lantern',
+        'items': [
+            {'category': 'Appetizers', 'name': 'Fresh Spring Rolls', 'price': 7, 'description': 'Rice paper rolls with herbs and peanut sauce'},
+            {'category': 'Main Course', 'name': 'Pad Thai', 'price': 15, 'description': 'Rice noodles, shrimp, tamarind, peanuts and lime'},
+            {'category': 'Main Course', 'name': 'Green Curry', 'price': 16, 'description': 'Coconut green curry with chicken and Thai basil'},
+            {'category': 'Desserts', 'name': 'Mango Sticky Rice', 'price': 8, 'description': 'Sweet coconut rice with ripe mango'},
+        ]
+    },
+    'chinese': {
+        'restaurantName': 'Golden Dragon Palace',
+        'items': [
+            {'category': 'Appetizers', 'name': 'Pork Dumplings', 'price': 8, 'description': 'Pan-fried dumplings with soy-vinegar dipping sauce'},
+            {'category': 'Main Course', 'name': 'Kung Pao Chicken', 'price': 16, 'description': 'Wok-tossed chicken, peanuts and dried chilies'},
+            {'category': 'Main Course', 'name': 'Beef & Broccoli', 'price': 17, 'description': 'Tender beef and broccoli in savory oyster sauce'},
+            {'category': 'Sides', 'name': 'Egg Fried Rice', 'price': 6, 'description': 'Jasmine rice with egg, scallions and peas'},
+        ]
+    },
+    'vegan': {
+        'restaurantName': 'Green Roots Kitchen',
+        'items': [
+            {'category': 'Bowls', 'name': 'Buddha Bowl', 'price': 14, 'description': 'Quinoa, roasted vegetables, chickpeas and tahini dressing'},
+            {'category': 'Main Course', 'name': 'Jackfruit Tacos', 'price': 13, 'description': 'Pulled barbecue jackfruit with avocado crema'},
+            {'category': 'Sides', 'name': 'Sweet Potato Fries', 'price': 5, 'description': 'Crispy baked fries with smoked paprika'},
+            {'category': 'Desserts', 'name': 'Avocado Chocolate Mousse', 'price': 7, 'description': 'Silky dairy-free mousse with fresh berries'},
+        ]
+    },
+    'seafood': {
+        'restaurantName': 'The Salty Anchor',
+        'items': [
+            {'category': 'Appetizers', 'name': 'Clam Chowder', 'price': 9, 'description': 'Creamy New England chowder with oyster crackers'},
+            {'category': 'Main Course', 'name': 'Lobster Roll', 'price': 28, 'description': 'Chilled lobster in a buttered toasted brioche roll'},
+            {'category': 'Main Course', 'name': 'Fish & Chips', 'price': 18, 'description': 'Beer-battered cod with fries and tartar sauce'},
+            {'category': 'Raw Bar', 'name': 'Oysters on the Half Shell', 'price': 18, 'description': 'Half dozen with mignonette and lemon'},
+        ]
+    },
+    'diner': {
+        'restaurantName': 'Route 66 Diner',
+        'items': [
+            {'category': 'Breakfast', 'name': 'Buttermilk Pancakes', 'price': 9, 'description': 'Fluffy stack with maple syrup and whipped butter'},
+            {'category': 'Main Course', 'name': 'Patty Melt', 'price': 12, 'description': 'Beef patty, Swiss and grilled onions on rye'},
+            {'category': 'Sides', 'name': 'Onion Rings', 'price': 5, 'description': 'Thick-cut and golden fried'},
+            {'category': 'Desserts', 'name': 'Apple Pie', 'price': 6, 'description': 'Homestyle pie served warm a la mode'},
+        ]
+    },
+    'brunch': {
+        'restaurantName': 'Sunny Side Social',
+        'items': [
+            {'category': 'Brunch', 'name': 'Eggs Benedict', 'price': 15, 'description': 'Poached eggs, Canadian bacon and hollandaise on muffins'},
+            {'category': 'Brunch', 'name': 'Avocado Toast', 'price': 12, 'description': 'Sourdough, smashed avocado, chili flakes and soft egg'},
+            {'category': 'Brunch', 'name': 'French Toast', 'price': 13, 'description': 'Brioche with berries, mascarpone and maple syrup'},
+            {'category': 'Drinks', 'name': 'Fresh Orange Juice', 'price': 5, 'description': 'Squeezed to order'},
+        ]
+    },
+    'ramen': {
+        'restaurantName': 'Umami Ramen House',
+        'items': [
+            {'category': 'Appetizers', 'name': 'Gyoza', 'price': 7, 'description': 'Crispy pan-fried pork and cabbage dumplings'},
+            {'category': 'Ramen', 'name': 'Tonkotsu Ramen', 'price': 16, 'description': 'Rich pork broth, chashu, soft egg and scallions'},
+            {'category': 'Ramen', 'name': 'Spicy Miso Ramen', 'price': 16, 'description': 'Miso broth with chili oil, ground pork and corn'},
+            {'category': 'Desserts', 'name': 'Matcha Ice Cream', 'price': 5, 'description': 'Earthy green tea ice cream'},
+        ]
+    },
+    'mediterranean': {
+        'restaurantName': 'Olive & Fig Mezze',
+        'items': [
+            {'category': 'Mezze', 'name': 'Hummus & Pita', 'price': 8, 'description': 'Creamy chickpea hummus with olive oil and warm pita'},
+            {'category': 'Mezze', 'name': 'Falafel', 'price': 9, 'description': 'Crispy herb falafel with tahini sauce'},
+            {'category': 'Main Course', 'name': 'Lamb Souvlaki', 'price': 21, 'description': 'Grilled lamb skewers with tzatziki and rice'},
+            {'category': 'Desserts', 'name': 'Baklava', 'price': 6, 'description': 'Layers of phyllo, pistachio and honey syrup'},
+        ]
+    },
+    'french bistro': {
+        'restaurantName': 'Le Petit Bistro',
+        'items': [
+            {'category': 'Appetizers', 'name': 'French Onion Soup', 'price': 10, 'description': 'Caramelized onion broth under melted gruyere'},
+            {'category': 'Main Course', 'name': 'Steak Frites', 'price': 28, 'description': 'Hanger steak with shallot butter and fries'},
+            {'category': 'Main Course', 'name': 'Coq au Vin', 'price': 26, 'description': 'Chicken braised in red wine with mushrooms'},
+            {'category': 'Desserts', 'name': 'Creme Brulee', 'price': 9, 'description': 'Vanilla custard with a caramelized sugar crust'},
+        ]
+    },
+    'ice cream shop': {
+        'restaurantName': 'The Scoop Spot',
+        'items': [
+            {'category': 'Ice Cream', 'name': 'Salted Caramel Scoop', 'price': 5, 'description': 'House-made caramel ice cream with sea salt'},
+            {'category': 'Sundaes', 'name': 'Hot Fudge Sundae', 'price': 8, 'description': 'Vanilla scoops, hot fudge, whipped cream and a cherry'},
+            {'category': 'Sundaes', 'name': 'Banana Split', 'price': 9, 'description': 'Three scoops with banana, sauces and nuts'},
+            {'category': 'Drinks', 'name': 'Root Beer Float', 'price': 6, 'description': 'Vanilla ice cream in frosty root beer'},
+        ]
+    },
+}
+
+# Common phrasings that map onto a canonical concept
+MENU_PRESET_ALIASES = {
+    'burger place': 'burger joint',
+    'burgers': 'burger joint',
+    'pizza place': 'pizzeria',
+    'pizza': 'pizzeria',
+    'italian restaurant': 'italian',
+    'sushi bar': 'sushi',
+    'sushi restaurant': 'sushi',
+    'mexican restaurant': 'mexican',
+    'tacos': 'taco truck',
+    'cafe': 'coffee shop',
+    'coffee': 'coffee shop',
+    'steak house': 'steakhouse',
+    'barbecue': 'bbq',
+    'indian restaurant': 'indian',
+    'thai restaurant': 'thai',
+    'chinese restaurant': 'chinese',
+    'vegan restaurant': 'vegan',
+    'seafood restaurant': 'seafood',
+    'brunch spot': 'brunch',
+    'ramen shop': 'ramen',
+    'bistro': 'french bistro',
+    'ice cream': 'ice cream shop',
+}
+
+# Filler phrasing stripped before matching ("I want to start a burger joint")
+_FILLER_RE = re.compile(r"^(i\s+(want|would like|'d like)\s+to\s+(start|open)\s+)?((a|an|the|my)\s+)?")
+# Unicode-aware, so accented and non-Latin prompts keep their letters
+_NON_WORD_RE = re.compile(r"[^\w' ]+")
+
+
+def normalize_concept(user_prompt: str) -> str:
+    """
+    Reduce a free-form prompt to a lookup key.
+
+    Args:
+        user_prompt: User's description of restaurant concept
+
+    Returns:
+        Lowercased concept with punctuation and filler phrasing removed,
+        or the lowercased prompt itself if nothing else would be left
+    """
+    lowered = user_prompt.lower()
+    key = ' '.join(_NON_WORD_RE.sub(' ', lowered).split())
+    key = _FILLER_RE.sub('', key, count=1).strip()
+    return key or ' '.join(lowered.split())
+
+
+def find_preset(user_prompt: str, cutoff: float = 0.85) -> Optional[Dict[str, Any]]:
+    """
+    Return a curated menu for a common concept, if one matches.
+
+    Args:
+        user_prompt: User's description of restaurant concept
+        cutoff: Minimum difflib similarity for a fuzzy match
+
+    Returns:
+        Copy of the preset menu, or None if no preset matches
+    """
+    key = normalize_concept(user_prompt)
+    key = MENU_PRESET_ALIASES.get(key, key)
+
+    if key not in MENU_PRESETS:
+        candidates = list(MENU_PRESETS) + list(MENU_PRESET_ALIASES)
+        matches = difflib.get_close_matches(key, candidates, n=1, cutoff=cutoff)
+        if not matches:
+            return None
+        key = MENU_PRESET_ALIASES.get(matches[0], matches[0])
+
+    return copy.deepcopy(MENU_PRESETS[key])
@@ -0,0 +1,49 @@
+"""
+Compact menu schema shared by the LLM client and the stream parser
+The model answers with single-letter keys; these helpers restore full field names
+"""
+
+from typing import Any, Dict
+
+
+# Compact item keys requested from the model -> full field names
+COMPACT_ITEM_KEYS = {'c': 'category', 'n': 'name', 'p': 'price', 'd': 'description'}
+
+
+def expand_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Expand a compact menu item to full field names.
+
+    Items already using full names are returned unchanged.
+
+    Args:
+        item: Menu item from the model
+
+    Returns:
+        Item with category/name/price/description keys
+    """
+    return {COMPACT_ITEM_KEYS.get(key, key): value for key, value in item.items()}
+
+
+def expand_menu(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Expand a compact {"n", "i"} menu to {"restaurantName", "items"}.
+
+    Menus already using full names are returned unchanged.
+
+    Args:
+        data: Parsed menu JSON from the model
+
+    Returns:
+        Menu dictionary with restaurantName and items
+    """
+    if not isinstance(data, dict) or 'restaurantName' in data or 'items' in data:
+        return data
+
+    menu = {key: value for key, value in data.items() if key not in ('n', 'i')}
+    if 'n' in data:
+        menu['restaurantName'] = data['n']
+    if 'i' in data:
+        items = data['i']
+        menu['items'] = [expand_item(item) for item in items] if isinstance(items, list) else items
+    return menu
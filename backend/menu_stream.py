@@ -0,0 +1,179 @@
+"""
+Incremental parser for streamed menu JSON
+Emits the restaurant name and each menu item as soon as they are complete
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import re
+
+import orjson
+
+from menu_schema import expand_item
+
+
+# Accept both the compact ("n"/"i") and full key names
+_NAME_RE = re.compile(r'"(?:restaurantName|n)"\s*:\s*"((?:[^"\\]|\\.)*)"')
+_ITEMS_RE = re.compile(r'"(?:items|i)"\s*:\s*\[')
+
+# Characters the item scanner acts on, outside and inside a string; the
+# regex engine skips everything in between in C
+_STRUCTURAL_RE = re.compile(r'["{}\]]')
+_STRING_SPECIAL_RE = re.compile(r'["\\]')
+
+
+class MenuStreamParser:
+    """Tolerant partial parser for the compact {"n", "i"} (or full) menu schema"""
+
+    def __init__(self):
+        """Initialize empty parser state"""
+        self.text = ""
+        self.restaurant_name = None
+        self.items = []
+        # True once the top-level menu object has closed
+        self.complete = False
+
+        # Start of the final answer (after any <think> block), or None while reasoning
+        self._answer_start = None
+        # Inside a leading <think> block, and where to resume looking for its end
+        self._in_think = False
+        self._think_scan = 0
+        self._name_end = None
+        # Scan state inside the items array
+        self._items_start = None
+        self._items_end = None
+        self._items_pos = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._object_start = None
+
+    def feed(self, delta: str) -> List[Tuple[str, Any]]:
+        """
+        Consume a streamed text delta.
+
+        Args:
+            delta: Next chunk of completion text
+
+        Returns:
+            List of newly completed (event, value) pairs, where event is
+            'restaurantName' (value is a str) or 'item' (value is a dict)
+        """
+        self.text += delta
+        events = []
+
+        if self._answer_start is None:
+            self._answer_start = self._find_answer_start()
+            if self._answer_start is None:
+                return events
+
+        if self._items_pos is None:
+            match = _ITEMS_RE.search(self.text, self._answer_start)
+            if match:
+                self._items_start = match.start()
+                self._items_pos = match.end()
+
+        # Item names share the "n" key, so only look for the restaurant
+        # name outside the items array
+        if self.restaurant_name is None:
+            end = self._items_start if self._items_start is not None else len(self.text)
+            events.extend(self._find_name(self._answer_start, end))
+
+        if self._items_pos is None:
+            return events
+
+        if self._items_end is None:
+            for item in self._scan_items():
+                self.items.append(item)
+                events.append(('item', item))
+
+        if self.restaurant_name is None and self._items_end is not None:
+            events.extend(self._find_name(self._items_end, len(self.text)))
+
+        if self.restaurant_name is not None and self._items_end is not None:
+            # Both fields are in; the next closing brace ends the object
+            tail_start = max(self._items_end, self._name_end)
+            self.complete = self.text.find('}', tail_start) != -1
+
+        return events
+
+    def _find_name(self, start: int, end: int) -> List[Tuple[str, Any]]:
+        """Search text[start:end] for the restaurant name"""
+        match = _NAME_RE.search(self.text, start, end)
+        if not match:
+            return []
+        self.restaurant_name = orjson.loads(f'"{match.group(1)}"')
+        self._name_end = match.end()
+        return [('restaurantName', self.restaurant_name)]
+
+    def _find_answer_start(self) -> Optional[int]:
+        """Locate where the JSON answer begins, skipping a leading <think> block"""
+        if not self._in_think:
+            stripped = self.text.lstrip()
+            if not stripped or '<think>'.startswith(stripped):
+                # Nothing yet, or only part of the opening tag
+                return None
+            if not stripped.startswith('<think>'):
+                return 0
+            self._in_think = True
+
+        # Only scan text that arrived since the last call (keeping enough
+        # overlap for a closing tag split across deltas), so a long
+        # reasoning stream is searched once rather than once per delta
+        end = self.text.find('</think>', self._think_scan)
+        if end == -1:
+            self._think_scan = max(0, len(self.text) - len('</think>') + 1)
+            return None
+        return end + len('</think>')
+
+    def _scan_items(self) -> List[Dict[str, Any]]:
+        """Advance through the items array and return objects that closed (expanded)"""
+        completed = []
+        text = self.text
+        pos = self._items_pos
+
+        while pos < len(text):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    pos += 1
+                    continue
+                match = _STRING_SPECIAL_RE.search(text, pos)
+                if match is None:
+                    pos = len(text)
+                    break
+                pos = match.start()
+                if text[pos] == '\\':
+                    self._escape = True
+                else:
+                    self._in_string = False
+                pos += 1
+                continue
+
+            match = _STRUCTURAL_RE.search(text, pos)
+            if match is None:
+                pos = len(text)
+                break
+            pos = match.start()
+            char = text[pos]
+            if char == '"':
+                self._in_string = True
+            elif char == '{':
+                if self._depth == 0:
+                    self._object_start = pos
+                self._depth += 1
+            elif char == '}':
+                self._depth -= 1
+                if self._depth == 0 and self._object_start is not None:
+                    try:
+                        completed.append(expand_item(orjson.loads(text[self._object_start:pos + 1])))
+                    except orjson.JSONDecodeError:
+                        pass
+                    self._object_start = None
+            elif char == ']' and self._depth == 0:
+                self._items_end = pos + 1
+                pos += 1
+                break
+            pos += 1
+
+        self._items_pos = pos
+        return completed
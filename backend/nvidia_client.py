@@ -3,33 +3,197 @@ NVIDIA Nemotron client wrapper for menu generation
 Handles API calls, retry logic, validation, and error handling
 """
 
-from openai import OpenAI, OpenAIError, RateLimitError, APIError
-from typing import Dict, Any, Tuple
-import time
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+import asyncio
+import atexit
+import email.utils
+import functools
+import importlib.util
+import itertools
 import json
+import logging
 import os
-import re
+import time
+
+from tenacity import AsyncRetrying, RetryCallState, Retrying, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+import httpx
+import json_repair
+import orjson
+
+from async_runtime import run_async
+from menu_schema import expand_menu
+from menu_stream import MenuStreamParser
+
+
+logger = logging.getLogger(__name__)
+
+
+def _load_openai():
+    """Import the OpenAI SDK on first use; it adds ~400 ms to every cold start"""
+    import openai
+    return openai
+
+
+def _transient_errors() -> Tuple[type, ...]:
+    """Failures worth retrying: rate limits, timeouts, dropped connections and 5xx"""
+    openai = _load_openai()
+    return (openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError, openai.InternalServerError)
+
+
+def _retry_after_seconds(error: Optional[BaseException]) -> Optional[float]:
+    """Seconds the server asked us to wait (retry-after-ms / Retry-After), if the error carries them"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        try:
+            return max(0.0, float(headers[name]) * scale)
+        except (KeyError, TypeError, ValueError):
+            pass
+
+    # Retry-After may also be an HTTP date
+    parsed = email.utils.parsedate_tz(headers.get("retry-after") or "")
+    if parsed is None:
+        return None
+    return max(0.0, email.utils.mktime_tz(parsed) - time.time())
+
+
+_NVIDIA_BASE_URL = "https://integrate.api.nvidia.com/v1"
+
+# Connection pool settings shared by the sync and async clients: warm
+# keep-alive connections are reused instead of reconnecting per request
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60)
+_HTTP_TIMEOUT = httpx.Timeout(120.0, connect=5.0)
+
+# HTTP/2 multiplexes concurrent completions over one TLS connection; it
+# needs the h2 package (httpx[http2]), so fall back to HTTP/1.1 without it
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+# Invariant menu instructions, sent as the system message so every request
+# shares an identical prefix (eligible for provider-side prompt caching).
+# The model answers in a compact schema with single-letter keys, which cuts
+# output tokens (and so generation latency); expand_menu() restores full names.
+_MENU_SYSTEM_PROMPT = """You are a restaurant menu creator AI. Given a description of a restaurant type or concept,
+generate a complete restaurant menu with a creative name, menu items organized by category, with prices and descriptions.
+
+Return ONLY compact JSON in this exact format (no markdown, no code blocks, no explanation):
+{"n":"Creative Restaurant Name","i":[{"c":"Category Name","n":"Item Name","p":12,"d":"Brief description"}]}
+
+Keys: n = restaurant name, i = items, c = category, n = item name, p = price, d = description
+
+Guidelines:
+- Create 3-6 menu items total
+- Use appropriate categories (Appetizers, Main Course, Sides, Desserts, Drinks, etc.)
+- Prices should be realistic numbers (no $ symbol, just the number)
+- Descriptions should be brief (under 15 words)
+- Make the restaurant name creative and fitting to the concept"""
+
+# Built once and shared by every request (the SDK only reads them). Nemotron
+# Super v1.5 reasons in a <think> block unless the system prompt says
+# /no_think; a 3-6 item menu doesn't need it, and skipping it cuts most of
+# the output tokens
+_MENU_SYSTEM_MESSAGE = {"role": "system", "content": _MENU_SYSTEM_PROMPT}
+_MENU_SYSTEM_MESSAGE_NO_THINK = {"role": "system", "content": "/no_think\n" + _MENU_SYSTEM_PROMPT}
 
 
 class NvidiaClient:
     """Lightweight NVIDIA Nemotron client for restaurant menu generation"""
 
+    # Reasoning block delimiters; class attributes so a subclass for another
+    # model can swap in its own
+    think_open = "<think>"
+    think_close = "</think>"
+
     def __init__(self):
         """Initialize NVIDIA client with OpenAI SDK"""
-        self.client = OpenAI(
-            base_url="https://integrate.api.nvidia.com/v1",
-            api_key=os.getenv("NVIDIA_API_KEY")
-        )
+        # One long-lived connection pool shared by chat and embedding calls
+        self._http = httpx.Client(http2=_HTTP2, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+        atexit.register(self._http.close)
+
+        # Comma-separated NVIDIA_API_KEYS spreads requests over several
+        # accounts' rate limits; a single NVIDIA_API_KEY still works
+        self.api_keys = [key.strip() for key in os.getenv("NVIDIA_API_KEYS", "").split(",") if key.strip()]
+        if not self.api_keys:
+            self.api_keys = [os.getenv("NVIDIA_API_KEY")]
+
+        # Per-key SDK clients, built on first use (see client / aclient) so
+        # importing this module stays cheap
+        self._clients = None
+        self._aclients = None
         self.model = "nvidia/llama-3.3-nemotron-super-49b-v1.5"
+        # Reasoning is off unless NVIDIA_REASONING=on
+        self.reasoning = os.getenv("NVIDIA_REASONING", "off").lower() in ("on", "true", "1")
+        # The system message depends only on the mode, so pick it here
+        # rather than on every request
+        self._system_message = _MENU_SYSTEM_MESSAGE if self.reasoning else _MENU_SYSTEM_MESSAGE_NO_THINK
+        self.embed_model = os.getenv("NVIDIA_EMBED_MODEL", "nvidia/nv-embedqa-e5-v5")
 
         # Default parameters matching nemotron reference
         self.default_temperature = 0.6
         self.default_top_p = 0.95
-        self.default_max_tokens = 32768
+        # A compact menu is a few hundred tokens; the cap bounds latency and
+        # cost when the model runs long (override per call for larger menus)
+        self.default_max_tokens = int(os.getenv("NVIDIA_MAX_TOKENS", "2048"))
+
+        # Retry configuration: jittered exponential backoff on transient errors
+        self.max_retries = 4
+        self.retry_delay = 1  # seconds, base of the backoff
+        self.max_retry_delay = 30  # seconds
+
+    @property
+    def client(self):
+        """
+        OpenAI SDK client for the next API key in rotation.
 
-        # Retry configuration for rate limiting
-        self.max_retries = 3
-        self.retry_delay = 2  # seconds
+        Each access advances the round robin, so a retry after a 429 goes
+        out on a different key. All keys share one connection pool.
+        """
+        if self._clients is None:
+            openai = _load_openai()
+            self._clients = itertools.cycle([
+                openai.OpenAI(
+                    base_url=_NVIDIA_BASE_URL,
+                    api_key=key,
+                    http_client=self._http,
+                    # Retries are handled here (with jitter) rather than by the SDK
+                    max_retries=0
+                )
+                for key in self.api_keys
+            ])
+        return next(self._clients)
+
+    @property
+    def aclient(self):
+        """
+        Async OpenAI SDK client for the next API key in rotation.
+
+        Only use it from the shared event loop (async_runtime.run_async):
+        its connection pool binds to the loop it first runs on.
+        """
+        if self._aclients is None:
+            openai = _load_openai()
+            http_client = httpx.AsyncClient(http2=_HTTP2, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+            # Closed on the loop it is bound to, like the sync pool at exit
+            atexit.register(self._close_async_http, http_client)
+            self._aclients = itertools.cycle([
+                openai.AsyncOpenAI(
+                    base_url=_NVIDIA_BASE_URL,
+                    api_key=key,
+                    http_client=http_client,
+                    max_retries=0
+                )
+                for key in self.api_keys
+            ])
+        return next(self._aclients)
+
+    @staticmethod
+    def _close_async_http(http_client: httpx.AsyncClient) -> None:
+        """Close the async connection pool on the shared loop (runs at exit)"""
+        try:
+            run_async(http_client.aclose(), timeout=5)
+        except Exception as e:
+            logger.debug("Could not close async NVIDIA connection pool: %s", e)
 
     def _extract_reasoning(self, content: str) -> Tuple[str, str]:
         """
@@ -43,25 +207,44 @@ class NvidiaClient:
         Returns:
             Tuple of (reasoning_process, final_answer)
         """
-        # Pattern to extract thinking process
-        think_pattern = r'<think>(.*?)</think>'
-        thinking_match = re.search(think_pattern, content, re.DOTALL)
+        # The delimiters are literals, so str.find (a memchr-backed scan)
+        # locates them far faster than a lazy .*? regex walking the whole
+        # reasoning text. An unclosed block is left in the answer
+        think_open, think_close = self.think_open, self.think_close
+        start = content.find(think_open)
+        if start < 0:
+            # With reasoning off most responses have no tags
+            return "", content
 
-        if thinking_match:
-            reasoning = thinking_match.group(1).strip()
-            # Remove thinking tags from content to get final answer
-            final_answer = re.sub(think_pattern, '', content, flags=re.DOTALL).strip()
-            return reasoning, final_answer
-        else:
-            # No reasoning tags found, entire content is the answer
+        reasoning_parts = []
+        answer_parts = []
+        pos = 0
+        while start >= 0:
+            end = content.find(think_close, start + len(think_open))
+            if end < 0:
+                break
+            answer_parts.append(content[pos:start])
+            reasoning_parts.append(content[start + len(think_open):end].strip())
+            pos = end + len(think_close)
+            start = content.find(think_open, pos)
+
+        if not reasoning_parts:
+            # No complete reasoning block, entire content is the answer
             return "", content
 
-    def generate_menu_json(self, user_prompt: str) -> Dict[str, Any]:
+        answer_parts.append(content[pos:])
+        return "\n".join(reasoning_parts), "".join(answer_parts).strip()
+
+    def generate_menu_json(self, user_prompt: str, max_tokens: Optional[int] = None) -> Dict[str, Any]:
         """
         Generate restaurant menu JSON from user prompt.
 
+        The completion is streamed and closed as soon as the menu object is
+        complete, so nothing is spent waiting on tokens after it.
+
         Args:
             user_prompt: User's description of restaurant concept
+            max_tokens: Optional output token cap (defaults to default_max_tokens)
 
         Returns:
             Dictionary with restaurantName and items array
@@ -69,141 +252,310 @@ class NvidiaClient:
         Raises:
             Exception: If all retry attempts fail
         """
-        prompt = self._build_menu_prompt(user_prompt)
-
-        # Attempt API call with retry logic
-        for attempt in range(self.max_retries):
-            try:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=self.default_temperature,
-                    top_p=self.default_top_p,
-                    max_tokens=self.default_max_tokens
-                )
+        messages = self._build_menu_messages(user_prompt)
+
+        try:
+            content = Retrying(**self._retry_policy())(self._complete_menu_text, messages, max_tokens)
+        except Exception as e:
+            return self._fallback_after_error(e)
+        return self._menu_from_completion(content)
+
+    async def agenerate_menu_json(self, user_prompt: str, max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Generate restaurant menu JSON without blocking a thread.
+
+        Same behaviour as generate_menu_json, but awaits the model on the
+        shared event loop, so any number of generations can be in flight
+        while request threads stay free.
+
+        Args:
+            user_prompt: User's description of restaurant concept
+            max_tokens: Optional output token cap (defaults to default_max_tokens)
 
-                content = response.choices[0].message.content
-                print(f"NVIDIA API response (first 200 chars): {content[:200]}")
-
-                # Extract reasoning from response (if present)
-                reasoning, final_answer = self._extract_reasoning(content)
-
-                if reasoning:
-                    print(f"🧠 Reasoning process (first 150 chars): {reasoning[:150]}...")
-                    print(f"📄 Final answer (first 200 chars): {final_answer[:200]}")
-
-                # Validate and parse only the final answer (without reasoning tags)
-                if self._validate_response(final_answer):
-                    menu_data = self._parse_json_response(final_answer)
-                    print(f"✓ Successfully generated menu: {menu_data.get('restaurantName', 'Unknown')}")
-                    return menu_data
-                else:
-                    print("⚠ Response validation failed, using fallback")
-                    return self._get_fallback_menu()
-
-            except RateLimitError as e:
-                if attempt < self.max_retries - 1:
-                    wait_time = self.retry_delay * (attempt + 1)
-                    print(f"⚠ Rate limit hit. Retrying in {wait_time}s... (attempt {attempt + 1}/{self.max_retries})")
-                    time.sleep(wait_time)
-                else:
-                    print(f"✗ Rate limit exceeded after {self.max_retries} attempts")
-                    return self._get_fallback_menu()
-
-            except APIError as e:
-                print(f"✗ NVIDIA API error: {e}")
-                if attempt < self.max_retries - 1:
-                    print(f"  Retrying... (attempt {attempt + 1}/{self.max_retries})")
-                    time.sleep(self.retry_delay)
-                else:
-                    print(f"  Failed after {self.max_retries} attempts, using fallback")
-                    return self._get_fallback_menu()
-
-            except OpenAIError as e:
-                print(f"✗ OpenAI SDK error: {e}")
-                return self._get_fallback_menu()
-
-            except Exception as e:
-                print(f"✗ Unexpected error in menu generation: {e}")
-                return self._get_fallback_menu()
-
-        # Should not reach here, but safety fallback
+        Returns:
+            Dictionary with restaurantName and items array
+        """
+        messages = self._build_menu_messages(user_prompt)
+
+        try:
+            content = await AsyncRetrying(**self._retry_policy())(self._acomplete_menu_text, messages, max_tokens)
+        except Exception as e:
+            return self._fallback_after_error(e)
+        return self._menu_from_completion(content)
+
+    async def abatch_menu_json(self, user_prompts: List[str], concurrency: int = 8) -> List[Dict[str, Any]]:
+        """
+        Generate menus for many prompts concurrently.
+
+        Args:
+            user_prompts: Restaurant concept descriptions
+            concurrency: Most completions in flight at once
+
+        Returns:
+            One menu per prompt, in order (the fallback menu where generation failed)
+        """
+        slots = asyncio.Semaphore(concurrency)
+
+        async def generate(user_prompt: str) -> Dict[str, Any]:
+            async with slots:
+                return await self.agenerate_menu_json(user_prompt)
+
+        return list(await asyncio.gather(*(generate(prompt) for prompt in user_prompts)))
+
+    def _retry_policy(self) -> Dict[str, Any]:
+        """Tenacity settings shared by the sync and async retry loops"""
+        # Full-jitter backoff spreads retries out, so concurrent requests
+        # hitting the same rate limit don't all come back at once
+        backoff = wait_random_exponential(multiplier=self.retry_delay, max=self.max_retry_delay)
+
+        def wait(retry_state: RetryCallState) -> float:
+            # Never retry sooner than a 429/503 Retry-After asks (within max_retry_delay)
+            delay = backoff(retry_state)
+            retry_after = _retry_after_seconds(retry_state.outcome.exception())
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, self.max_retry_delay))
+            return delay
+
+        return dict(
+            stop=stop_after_attempt(self.max_retries),
+            wait=wait,
+            retry=retry_if_exception_type(_transient_errors()),
+            before_sleep=self._log_retry,
+            reraise=True,
+        )
+
+    def _fallback_after_error(self, error: Exception) -> Dict[str, Any]:
+        """Log why menu generation failed and return the fallback menu"""
+        openai = _load_openai()
+        if isinstance(error, openai.RateLimitError):
+            logger.error("✗ Rate limit exceeded after %d attempts", self.max_retries)
+        elif isinstance(error, openai.APIError):
+            logger.error("✗ NVIDIA API error: %s", error)
+        elif isinstance(error, openai.OpenAIError):
+            logger.error("✗ OpenAI SDK error: %s", error)
+        else:
+            logger.error("✗ Unexpected error in menu generation: %s", error)
         return self._get_fallback_menu()
 
-    def _build_menu_prompt(self, user_prompt: str) -> str:
-        """Build the prompt for menu generation"""
-        return f"""You are a restaurant menu creator AI. Given a description of a restaurant type or concept,
-generate a complete restaurant menu with a creative name, menu items organized by category, with prices and descriptions.
+    def _menu_from_completion(self, content: str) -> Dict[str, Any]:
+        """Parse a finished completion, falling back if it isn't a valid menu"""
+        logger.debug("NVIDIA API response (first 200 chars): %.200s", content)
 
-User request: {user_prompt}
+        menu_data = self.parse_menu_response(content)
+        if menu_data is None:
+            logger.warning("⚠ Response validation failed, using fallback")
+            return self._get_fallback_menu()
+        return menu_data
 
-Return ONLY valid JSON in this exact format (no markdown, no code blocks, just raw JSON):
-{{
-    "restaurantName": "Creative Restaurant Name",
-    "items": [
-        {{"category": "Category Name", "name": "Item Name", "price": 12, "description": "Brief description"}},
-        ...
-    ]
-}}
+    def _complete_menu_text(self, messages: List[Dict[str, str]], max_tokens: Optional[int] = None) -> str:
+        """
+        Stream a completion until the menu object closes.
 
-Guidelines:
-- Create 3-6 menu items total
-- Use appropriate categories (Appetizers, Main Course, Sides, Desserts, Drinks, etc.)
-- Prices should be realistic numbers (no $ symbol, just the number)
-- Descriptions should be brief (under 15 words)
-- Make the restaurant name creative and fitting to the concept"""
+        Args:
+            messages: Chat messages to send
+            max_tokens: Optional output token cap
+
+        Returns:
+            Completion text received so far (reasoning plus menu JSON)
+        """
+        parser = MenuStreamParser()
+        for delta in self._stream_completion(messages, max_tokens):
+            parser.feed(delta)
+            if parser.complete:
+                break
+        return parser.text
+
+    async def _acomplete_menu_text(self, messages: List[Dict[str, str]], max_tokens: Optional[int] = None) -> str:
+        """Async version of _complete_menu_text"""
+        parser = MenuStreamParser()
+        stream = await self.aclient.chat.completions.create(**self._completion_params(messages, max_tokens))
+        # Leaving the block closes the response, so stopping early also stops the download
+        async with stream:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parser.feed(delta)
+                    if parser.complete:
+                        break
+        return parser.text
+
+    def _log_retry(self, retry_state: RetryCallState) -> None:
+        """Log a transient failure before tenacity sleeps and retries"""
+        logger.warning(
+            "⚠ NVIDIA request failed (%s). Retrying in %.1fs... (attempt %d/%d)",
+            retry_state.outcome.exception(),
+            retry_state.next_action.sleep,
+            retry_state.attempt_number,
+            self.max_retries,
+        )
 
-    def _validate_response(self, content: str) -> bool:
+    def stream_menu_text(self, user_prompt: str, max_tokens: Optional[int] = None) -> Iterator[str]:
         """
-        Validate that response has expected structure.
+        Stream raw completion text for a menu prompt.
+
+        Unlike generate_menu_json this makes a single attempt and raises on
+        API errors, so callers can fall back once tokens stop arriving.
+
+        Args:
+            user_prompt: User's description of restaurant concept
+            max_tokens: Optional output token cap (defaults to default_max_tokens)
+
+        Yields:
+            Content deltas as they arrive from the API
+        """
+        return self._stream_completion(self._build_menu_messages(user_prompt), max_tokens)
+
+    def _stream_completion(self, messages: List[Dict[str, str]], max_tokens: Optional[int] = None) -> Iterator[str]:
+        """
+        Stream content deltas for a chat completion.
+
+        The HTTP response is closed when the generator is, so a caller that
+        stops early also stops the download.
 
         Args:
-            content: Raw response content from API
+            messages: Chat messages to send
+            max_tokens: Optional output token cap (defaults to default_max_tokens)
+
+        Yields:
+            Content deltas as they arrive from the API
+        """
+        with self.client.chat.completions.create(**self._completion_params(messages, max_tokens)) as stream:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+
+    def _completion_params(self, messages: List[Dict[str, str]], max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """Streaming chat completion arguments shared by the sync and async paths"""
+        return dict(
+            model=self.model,
+            messages=messages,
+            temperature=self.default_temperature,
+            top_p=self.default_top_p,
+            max_tokens=max_tokens or self.default_max_tokens,
+            stream=True
+        )
+
+    def parse_menu_response(self, content: str) -> Optional[Dict[str, Any]]:
+        """
+        Strip reasoning from a full completion and parse the menu JSON.
+
+        Args:
+            content: Full response content
 
         Returns:
-            True if response is valid, False otherwise
+            Parsed menu dictionary, or None if the response is invalid
         """
-        if not content or len(content.strip()) == 0:
-            print("  Validation failed: Empty response")
-            return False
+        # Still run with reasoning off: the model can ignore /no_think, and a
+        # reply without tags costs only the substring check inside
+        reasoning, final_answer = self._extract_reasoning(content)
+
+        if reasoning:
+            logger.debug("🧠 Reasoning process (first 150 chars): %.150s...", reasoning)
+            logger.debug("📄 Final answer (first 200 chars): %.200s", final_answer)
+
+        # Parse the final answer (without reasoning tags) once, then validate it
+        menu_data = self._parse_json_response(final_answer)
+        if menu_data is None or not self._validate_response(menu_data):
+            return None
+
+        logger.info("✓ Successfully generated menu: %s", menu_data.get('restaurantName', 'Unknown'))
+        return menu_data
+
+    def embed(self, text: str) -> Optional[List[float]]:
+        """
+        Embed a short text with the hosted NVIDIA embedding model.
+
+        Args:
+            text: Text to embed (e.g. a user prompt)
+
+        Returns:
+            Embedding vector, or None if the request fails
+        """
+        vectors = self.embed_many([text])
+        return vectors[0] if vectors else None
 
-        # Try to parse as JSON
+    def embed_many(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """
+        Embed several short texts in one request.
+
+        Args:
+            texts: Texts to embed (e.g. user prompts)
+
+        Returns:
+            One embedding vector per text, in order, or None if the request fails
+        """
         try:
-            cleaned = self._clean_json(content)
-            data = json.loads(cleaned)
+            # The raw body is parsed with orjson; the SDK's pydantic models
+            # would otherwise validate every float of the vector
+            response = self.client.embeddings.with_raw_response.create(
+                model=self.embed_model,
+                input=texts,
+                encoding_format="float",
+                extra_body={"input_type": "query", "truncate": "END"}
+            )
+            data = orjson.loads(response.http_response.content)["data"]
+            # Entries carry their input index; don't rely on response order
+            return [entry["embedding"] for entry in sorted(data, key=lambda entry: entry.get("index", 0))]
+        except Exception as e:
+            logger.warning("⚠ Embedding request failed: %s", e)
+            return None
+
+    def is_fallback_menu(self, menu_data: Dict[str, Any]) -> bool:
+        """Check whether menu_data is the canned fallback menu"""
+        return menu_data == self._get_fallback_menu()
 
-            # Check required fields
-            if 'restaurantName' not in data:
-                print("  Validation failed: Missing 'restaurantName' field")
-                return False
+    def _build_menu_messages(self, user_prompt: str) -> List[Dict[str, str]]:
+        """Build the chat messages for menu generation (once per call, reused across retries)"""
+        return [
+            self._system_message,
+            {"role": "user", "content": f"User request: {user_prompt}"}
+        ]
+
+    def _validate_response(self, data: Any) -> bool:
+        """
+        Validate that a parsed response has the expected menu structure.
 
-            if 'items' not in data or not isinstance(data['items'], list):
-                print("  Validation failed: Missing or invalid 'items' field")
-                return False
+        Args:
+            data: Parsed (and expanded) response from _parse_json_response()
 
-            if len(data['items']) == 0:
-                print("  Validation failed: No menu items")
-                return False
+        Returns:
+            True if response is valid, False otherwise
+        """
+        if not isinstance(data, dict):
+            logger.warning("  Validation failed: Response is not a JSON object")
+            return False
 
-            # Validate at least one item has required fields
-            first_item = data['items'][0]
-            required_fields = ['category', 'name', 'price']
-            if not all(field in first_item for field in required_fields):
-                print(f"  Validation failed: Menu item missing required fields")
-                return False
+        # Check required fields
+        if 'restaurantName' not in data:
+            logger.warning("  Validation failed: Missing 'restaurantName' field")
+            return False
 
-            return True
+        if 'items' not in data or not isinstance(data['items'], list):
+            logger.warning("  Validation failed: Missing or invalid 'items' field")
+            return False
 
-        except json.JSONDecodeError as e:
-            print(f"  Validation failed: Invalid JSON - {e}")
+        if len(data['items']) == 0:
+            logger.warning("  Validation failed: No menu items")
             return False
-        except Exception as e:
-            print(f"  Validation failed: {e}")
+
+        # Validate at least one item has required fields
+        first_item = data['items'][0]
+        required_fields = ['category', 'name', 'price']
+        if not isinstance(first_item, dict) or not all(field in first_item for field in required_fields):
+            logger.warning("  Validation failed: Menu item missing required fields")
             return False
 
+        return True
+
     def _clean_json(self, content: str) -> str:
         """
-        Clean markdown code blocks and formatting from JSON response.
+        Extract the outermost {...} block from a response, dropping code
+        fences, leading whitespace and trailing prose.
 
         Args:
             content: Raw response content
@@ -211,33 +563,58 @@ Guidelines:
         Returns:
             Cleaned JSON string
         """
-        json_str = content.strip()
-
-        # Remove markdown code blocks
-        if json_str.startswith('```json'):
-            json_str = json_str[7:]
-        if json_str.startswith('```'):
-            json_str = json_str[3:]
-        if json_str.endswith('```'):
-            json_str = json_str[:-3]
+        # Already a bare object (the usual case): nothing to copy
+        if content[:1] == '{' and content[-1:] == '}':
+            return content
 
-        return json_str.strip()
+        start = content.find('{')
+        end = content.rfind('}')
+        return content[start:end + 1] if start != -1 and end > start else content.strip()
 
-    def _parse_json_response(self, content: str) -> Dict[str, Any]:
+    def _loads(self, json_str: str) -> Any:
         """
-        Parse and return validated menu data.
+        Parse JSON, attempting one repair pass before giving up.
 
         Args:
-            content: Response content to parse
+            json_str: JSON string to parse
 
         Returns:
-            Parsed menu dictionary
+            Parsed JSON value
 
         Raises:
-            json.JSONDecodeError: If parsing fails
+            json.JSONDecodeError: If the string cannot be parsed or repaired
+        """
+        try:
+            return orjson.loads(json_str)
+        except orjson.JSONDecodeError as e:
+            repaired = json_repair.loads(json_str)
+            if not isinstance(repaired, dict) or not repaired:
+                raise
+            logger.info("  Repaired malformed JSON response (%s)", e)
+            return repaired
+
+    def _parse_json_response(self, content: str) -> Optional[Dict[str, Any]]:
         """
-        cleaned = self._clean_json(content)
-        return json.loads(cleaned)
+        Parse menu data from the final answer, expanded to full field names.
+
+        Args:
+            content: Response content to parse
+
+        Returns:
+            Parsed menu dictionary, or None if the content is empty or not JSON
+        """
+        if not content or not content.strip():
+            logger.warning("  Validation failed: Empty response")
+            return None
+
+        try:
+            return expand_menu(self._loads(self._clean_json(content)))
+        except json.JSONDecodeError as e:
+            logger.warning("  Validation failed: Invalid JSON - %s", e)
+            return None
+        except Exception as e:
+            logger.warning("  Validation failed: %s", e)
+            return None
 
     def _get_fallback_menu(self) -> Dict[str, Any]:
         """
@@ -269,3 +646,18 @@ Guidelines:
                 }
             ]
         }
+
+
+@functools.lru_cache(maxsize=1)
+def get_nvidia_client() -> NvidiaClient:
+    """
+    Process-wide NvidiaClient.
+
+    Each NvidiaClient owns its own connection pool and SDK clients, so
+    constructing one per request would pay a fresh TCP + TLS handshake every
+    time; request handlers should go through this instead.
+
+    Returns:
+        The shared client, created on first call
+    """
+    return NvidiaClient()
@@ -0,0 +1,254 @@
+"""
+Semantic cache for generated menus
+Returns a stored menu for a repeated prompt, or one close enough in embedding space
+"""
+
+from array import array
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+import math
+import operator
+import os
+import sqlite3
+import threading
+
+import orjson
+
+from cache import CACHE_DIR, ResponseCache, defer_write
+
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Lossless exact-match key: lowercased with whitespace collapsed (any script survives)"""
+    return ' '.join(prompt.lower().split())
+
+
+class SemanticCache:
+    """Embedding-similarity cache persisted to SQLite"""
+
+    def __init__(
+        self,
+        name: str,
+        embed: Callable[[str], Optional[List[float]]],
+        threshold: float = 0.92,
+        max_entries: int = 1000,
+        normalize: Callable[[str], str] = normalize_prompt,
+        embed_many: Optional[Callable[[List[str]], Optional[List[List[float]]]]] = None,
+    ):
+        """
+        Initialize cache and load previously stored entries.
+
+        Args:
+            name: Database file name (without extension) inside CACHE_DIR
+            embed: Function returning an embedding vector for a prompt, or None on failure
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Most entries kept; the oldest are evicted first. Every
+                lookup is a linear scan, so keep this in the low thousands
+            normalize: Maps a prompt to its exact-match key; must keep distinct
+                prompts distinct, or one prompt's value is served for another
+            embed_many: Optional function embedding several prompts in one
+                call, used by get_many()
+        """
+        self.embed = embed
+        self.embed_many = embed_many
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.normalize = normalize
+
+        # Exact-match tier in front of the index: a repeated prompt is a
+        # local lookup instead of an embedding round trip plus a scan
+        self._exact = ResponseCache(f"{name}_exact", expire=30 * 86400)
+
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        self._db = sqlite3.connect(
+            os.path.join(CACHE_DIR, f"{name}.sqlite3"), check_same_thread=False, timeout=10
+        )
+        # WAL lets every gunicorn worker read while another one writes
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries (id INTEGER PRIMARY KEY, embedding BLOB, value TEXT)"
+        )
+        self._db.commit()
+        self._lock = threading.Lock()
+
+        # (unit vector, value) pairs scanned on every lookup; bounded, so
+        # appending past max_entries drops the oldest
+        self._entries = deque(maxlen=max_entries)
+        # Highest row id loaded; rows above it were written by other workers
+        self._last_id = 0
+        # Rows this process inserted, already in _entries
+        self._own_ids = set()
+        with self._lock:
+            self._load_new_rows()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, prompt: str) -> Tuple[Optional[Dict[str, Any]], Optional[array]]:
+        """
+        Find the stored value whose prompt is most similar to this one.
+
+        Args:
+            prompt: User prompt to look up
+
+        Returns:
+            Tuple of (cached value or None, prompt embedding or None).
+            The embedding is returned so a miss can be stored with put()
+            without embedding the prompt a second time.
+        """
+        key = self.normalize(prompt)
+        value = self._get_exact(key)
+        if value is not None:
+            return value, None
+
+        vector = self.embed(prompt)
+        if not vector:
+            return None, None
+        return self._search(key, self._normalize(vector), self._snapshot())
+
+    def get_many(self, prompts: List[str]) -> List[Tuple[Optional[Dict[str, Any]], Optional[array]]]:
+        """
+        Look up several prompts, embedding all exact-tier misses in one call.
+
+        Args:
+            prompts: User prompts to look up
+
+        Returns:
+            One (cached value or None, prompt embedding or None) tuple per
+            prompt, as get() returns
+        """
+        if self.embed_many is None:
+            return [self.get(prompt) for prompt in prompts]
+
+        results: List[Tuple[Optional[Dict[str, Any]], Optional[array]]] = [(None, None)] * len(prompts)
+        keys = [self.normalize(prompt) for prompt in prompts]
+        pending = []
+        for index, key in enumerate(keys):
+            value = self._get_exact(key)
+            if value is not None:
+                results[index] = (value, None)
+            else:
+                pending.append(index)
+        if not pending:
+            return results
+
+        vectors = self.embed_many([prompts[index] for index in pending])
+        if not vectors:
+            return results
+
+        entries = self._snapshot()
+        for index, vector in zip(pending, vectors):
+            if vector:
+                results[index] = self._search(keys[index], self._normalize(vector), entries)
+        return results
+
+    def _get_exact(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up the exact-match tier, counting a hit"""
+        # An empty key would pool every prompt that normalizes to nothing
+        value = self._exact.get(key) if key else None
+        if value is not None:
+            with self._lock:
+                self.hits += 1
+            logger.info("  ✓ Exact cache hit")
+        return value
+
+    def _snapshot(self) -> Tuple[Tuple[array, Dict[str, Any]], ...]:
+        """Current entries, including other workers' new rows, to scan without the lock"""
+        # Taken under the lock and scanned outside it, so a long scan never
+        # blocks put(), the background writer or other lookups
+        with self._lock:
+            self._load_new_rows()
+            return tuple(self._entries)
+
+    def _search(self, key: str, vector: array, entries: Tuple[Tuple[array, Dict[str, Any]], ...]) -> Tuple[Optional[Dict[str, Any]], Optional[array]]:
+        """Scan entries for the value most similar to a unit vector, as get() returns it"""
+        best_score, best_value = 0.0, None
+        for stored, value in entries:
+            score = sum(map(operator.mul, vector, stored))
+            if score > best_score:
+                best_score, best_value = score, value
+
+        with self._lock:
+            if best_value is not None and best_score >= self.threshold:
+                self.hits += 1
+            else:
+                self.misses += 1
+                return None, vector
+        logger.info("  ✓ Semantic cache hit (similarity %.3f)", best_score)
+
+        # Next time this exact prompt skips the embedding call
+        if key:
+            self._exact.set(key, best_value)
+        return best_value, vector
+
+    def put(self, prompt: str, vector: Optional[array], value: Dict[str, Any]) -> None:
+        """
+        Store a value under the given prompt and its embedding.
+
+        The in-memory index is updated immediately; the SQLite write is
+        deferred so it never delays the response.
+
+        Args:
+            prompt: User prompt the value was generated for
+            vector: Embedding returned by get(), or None if embedding failed
+            value: JSON-serializable value to cache
+        """
+        if not value:
+            return
+
+        key = self.normalize(prompt)
+        if key:
+            self._exact.set(key, value)
+        if vector is None:
+            return
+
+        with self._lock:
+            self._entries.append((vector, value))
+        defer_write(self._persist, vector, value)
+
+    def _persist(self, vector: array, value: Dict[str, Any]) -> None:
+        """Write an entry to SQLite (runs on the background writer)"""
+        row = (vector.tobytes(), orjson.dumps(value).decode())
+        with self._lock:
+            cursor = self._db.execute("INSERT INTO entries (embedding, value) VALUES (?, ?)", row)
+            # Keep the table at the same bound as the in-memory index
+            self._db.execute("DELETE FROM entries WHERE id <= ?", (cursor.lastrowid - self.max_entries,))
+            self._db.commit()
+            self._own_ids.add(cursor.lastrowid)
+
+    def _load_new_rows(self) -> None:
+        """Pull in rows added since the last load, e.g. by other workers (caller holds the lock)"""
+        rows = self._db.execute(
+            "SELECT id, embedding, value FROM entries WHERE id > ? ORDER BY id", (self._last_id,)
+        ).fetchall()
+        for row_id, blob, value in rows:
+            if row_id in self._own_ids:
+                self._own_ids.discard(row_id)
+            else:
+                self._entries.append((array('f', blob), orjson.loads(value)))
+            self._last_id = row_id
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters for this cache.
+
+        Returns:
+            Dictionary with hits, misses, hitRate and size
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRate': round(self.hits / total, 3) if total else 0.0,
+                'size': len(self._entries),
+            }
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> array:
+        """Scale a vector to unit length so dot product equals cosine similarity"""
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return array('f', (x / norm for x in vector))
@@ -0,0 +1,54 @@
+"""
+Duplicate call suppression for expensive work
+Concurrent callers with the same key share one execution and its result
+"""
+
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+import threading
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; later callers wait for its result"""
+
+    def __init__(self):
+        """Initialize an empty in-flight table"""
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[Any, bool]:
+        """
+        Call fn, or wait for the identical call already in flight.
+
+        Args:
+            key: Identifies equivalent calls
+            fn: Function to run if no call with this key is in flight
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Tuple of (result, shared), where shared is True if the result
+            came from another caller's execution. Exceptions raised by fn
+            propagate to every waiting caller.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
@@ -0,0 +1,87 @@
+"""
+Per-request latency instrumentation
+Times named stages and logs one JSON line per request
+"""
+
+from contextlib import contextmanager
+from typing import Any, Iterator
+import logging
+import time
+
+from flask import Flask, g, request
+import orjson
+
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """
+    Time a block and add its duration to the current request as <stage>_ms.
+
+    Repeated stages within one request accumulate.
+
+    Args:
+        stage: Stage name (e.g. 'images', 'menu', 'llm')
+    """
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter_ns() - start) / 1e6
+        timings = g.setdefault('timings', {})
+        key = f"{stage}_ms"
+        timings[key] = round(timings.get(key, 0) + elapsed_ms, 1)
+
+
+def record(name: str, value: Any) -> None:
+    """
+    Attach an extra field (e.g. n_items, ttft_ms) to the current request's timing line.
+
+    Args:
+        name: Field name
+        value: JSON-serializable value
+    """
+    g.setdefault('timings', {})[name] = value
+
+
+def elapsed_ms() -> float:
+    """Milliseconds since the current request started"""
+    return round((time.perf_counter_ns() - g.request_start_ns) / 1e6, 1)
+
+
+def log_request_timing(status: int) -> None:
+    """
+    Emit the timing line for the current request.
+
+    Args:
+        status: HTTP status code of the response
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    line = {'route': request.path, 'status': status}
+    line.update(g.get('timings', {}))
+    line['e2e_ms'] = elapsed_ms()
+    logger.info("⏱ %s", orjson.dumps(line).decode())
+
+
+def init_app(app: Flask) -> None:
+    """
+    Register request hooks that log timing for every API request.
+
+    Streaming responses log from their generator once the stream finishes,
+    since after_request runs before the body is sent.
+
+    Args:
+        app: Flask application
+    """
+    @app.before_request
+    def start_timer():
+        g.request_start_ns = time.perf_counter_ns()
+
+    @app.after_request
+    def log_timing(response):
+        if request.path.startswith('/api/') and not response.is_streamed:
+            log_request_timing(response.status_code)
+        return response
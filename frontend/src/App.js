@@ -19,15 +19,38 @@ function App() {
 
     setLoading(true);
     try {
-      const response = await fetch('/api/surprise', {
+      const response = await fetch('/api/surprise/stream', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ prompt: surprisePrompt }),
       });
 
-      const data = await response.json();
-      setRestaurantName(data.restaurantName);
-      setItems(data.items);
+      // Render the name and items as the server streams them in
+      setItems([]);
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+        for (const event of events) {
+          if (!event.startsWith('data: ')) continue;
+          const data = JSON.parse(event.slice(6));
+          if (data.type === 'restaurantName') {
+            setRestaurantName(data.restaurantName);
+          } else if (data.type === 'item') {
+            setItems((prev) => [...prev, data.item]);
+          } else if (data.type === 'done') {
+            setRestaurantName(data.menu.restaurantName);
+            setItems(data.menu.items);
+          }
+        }
+      }
       setLoading(false);
     } catch (error) {
       console.error('Error:', error);